@@ -0,0 +1,135 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+
+import base64
+import hashlib
+import json
+import logging
+import os
+import random
+import time
+
+from odoo import _, api, models
+from odoo.exceptions import UserError
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+_logger = logging.getLogger(__name__)
+
+PARAM_PREFIX = "base_delivery_carrier_label.transport_"
+
+
+class CarrierTransport(models.AbstractModel):
+    """ HTTP transport used by the carrier modules to reach their APIs
+
+    Carrier modules should send their requests through
+    `self.env["carrier.transport"].request()` instead of calling
+    `requests` directly. Depending on the `transport_mode` system
+    parameter, requests are:
+
+    * `live` (default): sent to the carrier
+    * `record`: sent to the carrier and saved with their response in
+      the `transport_path` directory
+    * `replay`: answered from the `transport_path` directory without
+      any network access, after `transport_latency` seconds and failing
+      with a connection error at the `transport_error_rate` (0 to 1)
+
+    """
+
+    _name = "carrier.transport"
+    _description = "Carrier HTTP transport"
+
+    @api.model
+    def _get_transport_config(self):
+        get_param = self.env["ir.config_parameter"].sudo().get_param
+        return {
+            "mode": get_param(PARAM_PREFIX + "mode", "live"),
+            "path": get_param(PARAM_PREFIX + "path", ""),
+            "latency": float(get_param(PARAM_PREFIX + "latency", 0.0)),
+            "error_rate": float(get_param(PARAM_PREFIX + "error_rate", 0.0)),
+        }
+
+    @api.model
+    def _get_request_key(self, method, url, kwargs):
+        """ Identify a request by its method, url, parameters and body """
+        payload = json.dumps(
+            [
+                method.upper(),
+                url,
+                kwargs.get("params"),
+                kwargs.get("data"),
+                kwargs.get("json"),
+            ],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    @api.model
+    def _get_record_filename(self, config, key):
+        if not config["path"]:
+            raise UserError(
+                _(
+                    "The '%spath' system parameter is required to record or "
+                    "replay the carrier requests."
+                )
+                % PARAM_PREFIX
+            )
+        return os.path.join(config["path"], "%s.json" % key)
+
+    @api.model
+    def _record(self, filename, method, url, response):
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        record = {
+            "request": {"method": method.upper(), "url": url},
+            "response": {
+                "status_code": response.status_code,
+                "headers": dict(response.headers),
+                "url": response.url,
+                "encoding": response.encoding,
+                "content": base64.b64encode(response.content).decode("ascii"),
+            },
+        }
+        with open(filename, "w") as record_file:
+            json.dump(record, record_file)
+
+    @api.model
+    def _replay(self, filename, config, method, url):
+        if not os.path.exists(filename):
+            raise UserError(
+                _("No recorded carrier response for %s %s.") % (method.upper(), url)
+            )
+        if config["latency"]:
+            time.sleep(config["latency"])
+        if config["error_rate"] and random.random() < config["error_rate"]:
+            raise requests.exceptions.ConnectionError(
+                "Carrier transport error injected on replay"
+            )
+        with open(filename) as record_file:
+            values = json.load(record_file)["response"]
+        response = requests.Response()
+        response.status_code = values["status_code"]
+        response.headers = CaseInsensitiveDict(values["headers"])
+        response.url = values["url"]
+        response.encoding = values["encoding"]
+        response._content = base64.b64decode(values["content"])
+        return response
+
+    @api.model
+    def request(self, method, url, **kwargs):
+        """ Send a request to a carrier, same signature as
+        `requests.request()`
+
+        :return: requests.Response
+        """
+        config = self._get_transport_config()
+        if config["mode"] not in ("record", "replay"):
+            return requests.request(method, url, **kwargs)
+        key = self._get_request_key(method, url, kwargs)
+        filename = self._get_record_filename(config, key)
+        if config["mode"] == "replay":
+            return self._replay(filename, config, method, url)
+        response = requests.request(method, url, **kwargs)
+        self._record(filename, method, url, response)
+        _logger.debug("Carrier request %s %s recorded in %s", method, url, filename)
+        return response
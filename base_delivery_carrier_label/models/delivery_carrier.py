@@ -16,6 +16,15 @@ class DeliveryCarrier(models.Model):
         inverse_name="carrier_id",
         string="Option",
     )
+    label_per_package = fields.Boolean(
+        string="Checkpoint Labels per Package",
+        help="Request the labels one package at a time and save each of "
+        "them in its own transaction, so that "
+        "a carrier failure doesn't discard the labels already generated and "
+        "a new attempt only requests the missing ones. The carrier module "
+        "must request labels for the packages returned by "
+        "_get_packages_from_picking() only.",
+    )
 
     def default_options(self):
         """ Returns default and available options for a carrier """
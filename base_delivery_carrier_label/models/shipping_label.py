@@ -20,3 +20,11 @@ class ShippingLabel(models.Model):
         required=True,
         ondelete="cascade",
     )
+    tracking_number = fields.Char(copy=False)
+    fingerprint = fields.Char(
+        index=True,
+        copy=False,
+        help="Hash of the carrier, options, packages and addresses used to "
+        "request this label. A label whose fingerprint still matches the "
+        "picking is reused instead of calling the carrier again.",
+    )
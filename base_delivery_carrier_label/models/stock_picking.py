@@ -2,6 +2,8 @@
 # Copyright 2013-2016 Camptocamp SA
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
 
+import hashlib
+import json
 import logging
 
 from odoo import _, api, fields, models
@@ -93,35 +95,193 @@ class StockPicking(models.Model):
                 package = self.env["stock.quant.package"].create({})
                 move_lines.write({"result_package_id": package.id})
 
+    def _get_label_address_values(self, partner):
+        """ Address values of a partner taken into account in the label
+        fingerprint
+        """
+        return [
+            partner.id,
+            partner.name,
+            partner.street,
+            partner.street2,
+            partner.zip,
+            partner.city,
+            partner.state_id.id,
+            partner.country_id.id,
+            partner.phone,
+            partner.mobile,
+            partner.email,
+        ]
+
+    def _get_label_fingerprint_values(self):
+        """ Inputs of the label request the fingerprint is built on
+
+        Inherit this method in your carrier module to add any other value
+        your carrier relies on to build the labels.
+        """
+        self.ensure_one()
+        return {
+            "carrier": [self.carrier_id.id, self.carrier_id.code],
+            "options": sorted(self.option_ids.ids),
+            "packages": [
+                [package.id, package.weight, package.packaging_id.id]
+                for package in self._get_packages_from_picking().sorted("id")
+            ],
+            "recipient": self._get_label_address_values(self.partner_id),
+            "sender": self._get_label_address_values(self._get_label_sender_address()),
+        }
+
+    def _get_label_fingerprint(self):
+        """ Hash of the label inputs, used to reuse existing labels """
+        self.ensure_one()
+        values = self._get_label_fingerprint_values()
+        payload = json.dumps(values, sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def _get_fingerprinted_labels(self):
+        """ Labels of the picking that can still be reused """
+        self.ensure_one()
+        return self.env["shipping.label"].search(
+            [
+                ("res_id", "=", self.id),
+                ("res_model", "=", "stock.picking"),
+                ("fingerprint", "!=", False),
+            ]
+        )
+
+    def _create_shipping_label_records(
+        self, shipping_labels, fingerprint, package=None
+    ):
+        """ Create the shipping.label records of the labels returned by
+        `generate_shipping_labels()`
+
+        :param package: package the labels were requested for, if any
+        """
+        self.ensure_one()
+        context_attachment = self.env.context.copy()
+        # remove default_type setted for stock_picking
+        # as it would try to define default value of attachement
+        if "default_type" in context_attachment:
+            del context_attachment["default_type"]
+        for label in shipping_labels:
+            data = self.get_shipping_label_values(label)
+            data["fingerprint"] = fingerprint
+            data["tracking_number"] = label.get("tracking_number")
+            package_id = label.get("package_id") or (package and package.id)
+            if package_id:
+                data["package_id"] = package_id
+            self.env["shipping.label"].with_context(context_attachment).create(data)
+
+    def _write_labels_tracking(self, shipping_labels, package=None):
+        """ Set the tracking numbers of the labels on their packages """
+        package_obj = self.env["stock.quant.package"]
+        for label in shipping_labels:
+            package_id = label.get("package_id") or (package and package.id)
+            if package_id and label.get("tracking_number"):
+                package_obj.browse(package_id).write(
+                    {"parcel_tracking": label.get("tracking_number")}
+                )
+
+    def _create_shipping_labels(self, shipping_labels, fingerprint, package=None):
+        self._create_shipping_label_records(shipping_labels, fingerprint, package)
+        self._write_labels_tracking(shipping_labels, package)
+
+    def _store_label_checkpoint(self, shipping_labels, fingerprint, package):
+        """ Save the labels of a package in their own transaction
+
+        So a carrier failure on a next package, or any later error of the
+        caller, doesn't roll them back and they are not requested again on
+        the next attempt, without committing the caller's transaction.
+        Labels of pickings or packages not committed yet can't be saved
+        apart, they are created in the current transaction.
+
+        :return: True if the labels were saved in their own transaction
+        """
+        self.ensure_one()
+        self.flush()
+        with self.pool.cursor() as cr:
+            env = api.Environment(cr, self.env.uid, self.env.context)
+            picking = self.with_env(env)
+            if not (picking.exists() and package.with_env(env).exists()):
+                return False
+            picking._create_shipping_label_records(
+                shipping_labels, fingerprint, package.with_env(env)
+            )
+        return True
+
+    def _generate_carrier_label_per_package(self, fingerprint, valid_labels):
+        """ Request the labels package by package, saving each of them in
+        its own transaction
+
+        Only the packages without a valid label are requested, so a retry
+        after a failure resumes where the previous attempt stopped.
+        """
+        self.ensure_one()
+        packages = self._get_packages_from_picking()
+        for label in valid_labels.filtered("tracking_number"):
+            if label.package_id and not label.package_id.parcel_tracking:
+                label.package_id.parcel_tracking = label.tracking_number
+        for package in packages - valid_labels.mapped("package_id"):
+            shipping_labels = self.with_context(
+                label_package_ids=package.ids
+            ).generate_shipping_labels()
+            if not self._store_label_checkpoint(shipping_labels, fingerprint, package):
+                self._create_shipping_label_records(
+                    shipping_labels, fingerprint, package
+                )
+            self._write_labels_tracking(shipping_labels, package)
+        if len(packages) == 1 and packages.parcel_tracking:
+            self.write({"carrier_tracking_ref": packages.parcel_tracking})
+
     def action_generate_carrier_label(self):
         """ Method for the 'Generate Label' button.
 
         It will generate the labels for all the packages of the picking.
         Packages are mandatory in this case
 
+        Labels already generated with the same inputs (see
+        `_get_label_fingerprint()`) are reused instead of calling the
+        carrier again, unless the `force_label_regenerate` key is set
+        in the context.
+
+        When the carrier checkpoints labels per package, labels are
+        requested and saved one package at a time.
+
         """
-        package_obj = self.env["stock.quant.package"]
+        force = self.env.context.get("force_label_regenerate")
         for pick in self:
             pick._set_a_default_package()
+            fingerprint = pick._get_label_fingerprint()
+            existing_labels = pick._get_fingerprinted_labels()
+            valid_labels = existing_labels.filtered(
+                lambda label: not force and label.fingerprint == fingerprint
+            )
+            # labels generated from other inputs must never be reused
+            (existing_labels - valid_labels).write({"fingerprint": False})
+            if pick.carrier_id.label_per_package:
+                pick._generate_carrier_label_per_package(fingerprint, valid_labels)
+                continue
+            if valid_labels:
+                continue
             shipping_labels = pick.generate_shipping_labels()
-            for label in shipping_labels:
-                data = pick.get_shipping_label_values(label)
-                if label.get("package_id"):
-                    data["package_id"] = label["package_id"]
-                    if label.get("tracking_number"):
-                        package_obj.browse(label["package_id"]).write(
-                            {"parcel_tracking": label.get("tracking_number")}
-                        )
-                context_attachment = self.env.context.copy()
-                # remove default_type setted for stock_picking
-                # as it would try to define default value of attachement
-                if "default_type" in context_attachment:
-                    del context_attachment["default_type"]
-                self.env["shipping.label"].with_context(context_attachment).create(data)
+            pick._create_shipping_labels(shipping_labels, fingerprint)
             if len(shipping_labels) == 1:
-                pick.write({"carrier_tracking_ref": label.get("tracking_number")})
+                pick.write(
+                    {"carrier_tracking_ref": shipping_labels[0].get("tracking_number")}
+                )
         return True
 
+    def action_regenerate_carrier_label(self):
+        """ Method for the 'Regenerate Label' button.
+
+        Always call the carrier, even if the existing labels still match
+        the picking.
+
+        """
+        return self.with_context(
+            force_label_regenerate=True
+        ).action_generate_carrier_label()
+
     @api.onchange("carrier_id")
     def onchange_carrier_id(self):
         """ Inherit this method in your module """
@@ -178,7 +338,11 @@ class StockPicking(models.Model):
 
     @api.returns("stock.quant.package")
     def _get_packages_from_picking(self):
-        """ Get all the packages from the picking """
+        """ Get all the packages from the picking
+
+        Restricted to the `label_package_ids` of the context when the labels
+        are requested package by package.
+        """
         self.ensure_one()
         operation_obj = self.env["stock.move.line"]
         packages = self.env["stock.quant.package"].browse()
@@ -194,6 +358,8 @@ class StockPicking(models.Model):
             # Take the destination package. If empty, the package is
             # moved so take the source one.
             packages |= operation.result_package_id or operation.package_id
+        if "label_package_ids" in self.env.context:
+            packages &= packages.browse(self.env.context["label_package_ids"])
         return packages
 
     def write(self, vals):
@@ -1,2 +1,4 @@
 from . import test_get_weight
 from . import test_manifest_wizard
+from . import test_shipping_label_cache
+from . import test_carrier_transport
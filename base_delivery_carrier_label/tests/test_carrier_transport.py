@@ -0,0 +1,60 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+
+import shutil
+import tempfile
+from unittest import mock
+
+from odoo.exceptions import UserError
+from odoo.tests.common import TransactionCase
+
+import requests
+
+PARAM_PREFIX = "base_delivery_carrier_label.transport_"
+URL = "https://carrier.example.com/labels"
+
+
+class TestCarrierTransport(TransactionCase):
+    def setUp(self):
+        super().setUp()
+        self.path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.path)
+        self.transport = self.env["carrier.transport"]
+        self._set_params(path=self.path)
+
+    def _set_params(self, **params):
+        for key, value in params.items():
+            self.env["ir.config_parameter"].set_param(PARAM_PREFIX + key, value)
+
+    def _response(self):
+        response = requests.Response()
+        response.status_code = 200
+        response.headers["Content-Type"] = "application/json"
+        response.url = URL
+        response.encoding = "utf-8"
+        response._content = b'{"tracking": "TRACK"}'
+        return response
+
+    def test_record_replay(self):
+        self._set_params(mode="record")
+        with mock.patch.object(
+            requests, "request", return_value=self._response()
+        ) as request:
+            self.transport.request("POST", URL, json={"weight": 1})
+        self.assertEqual(request.call_count, 1)
+        self._set_params(mode="replay")
+        with mock.patch.object(requests, "request") as request:
+            response = self.transport.request("POST", URL, json={"weight": 1})
+        self.assertFalse(request.called)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["content-type"], "application/json")
+        self.assertEqual(response.json(), {"tracking": "TRACK"})
+        with self.assertRaises(UserError):
+            self.transport.request("POST", URL, json={"weight": 2})
+
+    def test_replay_error_rate(self):
+        self._set_params(mode="record")
+        with mock.patch.object(requests, "request", return_value=self._response()):
+            self.transport.request("GET", URL)
+        self._set_params(mode="replay", error_rate="1")
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            self.transport.request("GET", URL)
@@ -0,0 +1,132 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+
+import base64
+from unittest import mock
+
+from odoo.exceptions import UserError
+from odoo.tests.common import SavepointCase
+
+LABEL = {
+    "name": "label",
+    "file": base64.b64encode(b"label"),
+    "file_type": "pdf",
+    "tracking_number": "TRACK",
+}
+
+
+class TestShippingLabelCache(SavepointCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.carrier = cls.env.ref("delivery.free_delivery_carrier")
+        cls.partner = cls.env["res.partner"].create(
+            {"name": "Test customer", "street": "First street"}
+        )
+        picking_type = cls.env.ref("stock.picking_type_out")
+        cls.picking = cls.env["stock.picking"].create(
+            {
+                "partner_id": cls.partner.id,
+                "picking_type_id": picking_type.id,
+                "location_id": picking_type.default_location_src_id.id,
+                "location_dest_id": cls.env.ref("stock.stock_location_customers").id,
+                "carrier_id": cls.carrier.id,
+            }
+        )
+
+    def _generate_labels(self, method="action_generate_carrier_label"):
+        """Generate the labels and return the number of carrier calls"""
+        with mock.patch.object(
+            type(self.picking),
+            "generate_shipping_labels",
+            side_effect=lambda: [dict(LABEL)],
+        ) as generate_shipping_labels:
+            getattr(self.picking, method)()
+        return generate_shipping_labels.call_count
+
+    def _get_labels(self):
+        return self.env["shipping.label"].search(
+            [("res_id", "=", self.picking.id), ("res_model", "=", "stock.picking")]
+        )
+
+    def test_reuse_label(self):
+        self.assertEqual(self._generate_labels(), 1)
+        label = self._get_labels()
+        self.assertEqual(label.fingerprint, self.picking._get_label_fingerprint())
+        self.assertEqual(self._generate_labels(), 0)
+        self.assertEqual(self._get_labels(), label)
+
+    def test_invalidate_label(self):
+        self._generate_labels()
+        label = self._get_labels()
+        self.partner.street = "Second street"
+        self.assertEqual(self._generate_labels(), 1)
+        self.assertFalse(label.fingerprint)
+        self.assertEqual(len(self._get_labels()), 2)
+
+    def test_force_regenerate_label(self):
+        self._generate_labels()
+        self.assertEqual(self._generate_labels("action_regenerate_carrier_label"), 1)
+        self.assertEqual(len(self._get_labels().filtered("fingerprint")), 1)
+
+    def test_resume_label_per_package(self):
+        # labels are saved with a new cursor, share the test transaction
+        self.registry.enter_test_mode(self.cr)
+        self.addCleanup(self.registry.leave_test_mode)
+        self.carrier.label_per_package = True
+        product = self.env["product.product"].create(
+            {"name": "Test product", "type": "consu"}
+        )
+        packages = self.env["stock.quant.package"]
+        for __ in range(2):
+            package = packages.create({})
+            self.env["stock.move.line"].create(
+                {
+                    "picking_id": self.picking.id,
+                    "product_id": product.id,
+                    "product_uom_id": product.uom_id.id,
+                    "location_id": self.picking.location_id.id,
+                    "location_dest_id": self.picking.location_dest_id.id,
+                    "result_package_id": package.id,
+                    "qty_done": 1,
+                }
+            )
+            packages |= package
+        requested = []
+
+        def generate_shipping_labels(picking, fail_package=None):
+            package = picking._get_packages_from_picking()
+            requested.append(package)
+            if package == fail_package:
+                raise UserError("Carrier failure")
+            return [dict(LABEL, tracking_number=package.name)]
+
+        with mock.patch.object(
+            type(self.picking),
+            "generate_shipping_labels",
+            autospec=True,
+            side_effect=lambda picking: generate_shipping_labels(picking, packages[1]),
+        ):
+            # no assertRaises, its savepoint would discard the labels saved
+            # by the checkpoints
+            try:
+                self.picking.action_generate_carrier_label()
+            except UserError:
+                pass
+            else:
+                self.fail("The carrier failure should be raised")
+        self.assertEqual(requested, [packages[0], packages[1]])
+        self.assertEqual(self._get_labels().mapped("package_id"), packages[0])
+        requested.clear()
+        with mock.patch.object(
+            type(self.picking),
+            "generate_shipping_labels",
+            autospec=True,
+            side_effect=generate_shipping_labels,
+        ):
+            self.picking.action_generate_carrier_label()
+            self.assertEqual(requested, [packages[1]])
+            self.assertEqual(self._get_labels().mapped("package_id"), packages)
+            requested.clear()
+            self.picking.action_generate_carrier_label()
+            self.assertFalse(requested)
+        self.assertEqual(packages[1].parcel_tracking, packages[1].name)
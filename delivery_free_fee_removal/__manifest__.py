@@ -4,12 +4,17 @@
 {
     "name": "Delivery Free Fee Removal",
     "summary": "Hide free fee lines on sales orders",
-    "version": "13.0.1.0.1",
+    "version": "13.0.1.1.0",
     "category": "Delivery",
     "website": "https://github.com/OCA/delivery-carrier",
     "author": "Tecnativa, Camptocamp, Odoo Community Association (OCA)",
     "installable": True,
     "license": "AGPL-3",
     "depends": ["delivery"],
-    "data": ["views/sale_order_views.xml", "reports/sale_report_templates.xml"],
+    "pre_init_hook": "pre_init_hook",
+    "data": [
+        "data/ir_cron.xml",
+        "views/sale_order_views.xml",
+        "reports/sale_report_templates.xml",
+    ],
 }
@@ -0,0 +1,39 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# number of sale line ids updated by a single statement
+CHUNK_SIZE = 50000
+
+
+def pre_init_hook(cr):
+    """ Create and fill the is_free_delivery column before the install, so
+    the ORM doesn't compute it for every existing sale line. Only delivery
+    lines can be free deliveries: their total is zero when it rounds to zero
+    in their currency, as `currency.is_zero()`.
+    """
+    _logger.info("Creating the is_free_delivery column of sale order lines")
+    cr.execute(
+        """
+        ALTER TABLE sale_order_line
+        ADD COLUMN IF NOT EXISTS is_free_delivery BOOLEAN
+        """
+    )
+    cr.execute("SELECT MIN(id), MAX(id) FROM sale_order_line WHERE is_delivery")
+    min_id, max_id = cr.fetchone()
+    if min_id is None:
+        return
+    for start in range(min_id, max_id + 1, CHUNK_SIZE):
+        cr.execute(
+            """
+            UPDATE sale_order_line sol
+            SET is_free_delivery = ABS(sol.price_total) < currency.rounding / 2
+            FROM res_currency currency
+            WHERE currency.id = sol.currency_id
+                AND sol.is_delivery
+                AND sol.id >= %s AND sol.id < %s
+            """,
+            (start, start + CHUNK_SIZE),
+        )
+        _logger.info("is_free_delivery set on %s delivery lines", cr.rowcount)
@@ -0,0 +1,60 @@
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html).
+import logging
+
+from odoo import api, models
+from odoo.tools import split_every
+
+_logger = logging.getLogger(__name__)
+
+# number of sale lines deleted by a single unlink
+REMOVAL_CHUNK_SIZE = 1000
+
+
+class SaleOrder(models.Model):
+    _inherit = "sale.order"
+
+    @api.model
+    def _remove_free_delivery_lines(self, order_ids=None):
+        """ Delete the free delivery lines of confirmed orders that are not
+        locked and that weren't invoiced, so invoicing doesn't filter them
+        out on each run.
+
+        The lines are selected in SQL and unlinked by chunks, delivery lines
+        can be unlinked on confirmed orders. Their total is zero, so the
+        order amounts don't change.
+
+        :param order_ids: orders to clean, all of them if None
+        :return: number of deleted lines
+        """
+        self.env["sale.order.line"].flush()
+        self.flush(["state"])
+        self.env.cr.execute(
+            """
+            SELECT sol.id
+            FROM sale_order_line sol
+            JOIN sale_order so ON so.id = sol.order_id
+            WHERE sol.is_free_delivery
+                AND so.state = 'sale'
+                AND (%s OR so.id = ANY(%s))
+                AND NOT EXISTS (
+                    SELECT 1 FROM sale_order_line_invoice_rel rel
+                    WHERE rel.order_line_id = sol.id
+                )
+            """,
+            (order_ids is None, list(order_ids or [])),
+        )
+        line_ids = [row[0] for row in self.env.cr.fetchall()]
+        for chunk in split_every(REMOVAL_CHUNK_SIZE, line_ids):
+            self.env["sale.order.line"].browse(chunk).unlink()
+            self.env["sale.order.line"].flush()
+            self.invalidate_cache()
+        if line_ids:
+            _logger.info("%s free delivery lines removed", len(line_ids))
+        return len(line_ids)
+
+    def action_remove_free_delivery_lines(self):
+        return self._remove_free_delivery_lines(self.ids)
+
+    @api.model
+    def _cron_remove_free_delivery_lines(self):
+        self._remove_free_delivery_lines()
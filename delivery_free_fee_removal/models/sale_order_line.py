@@ -7,14 +7,25 @@ from odoo import api, fields, models
 class SaleOrderLine(models.Model):
     _inherit = "sale.order.line"
 
-    is_free_delivery = fields.Boolean(compute="_compute_is_free_delivery", store=True,)
+    is_free_delivery = fields.Boolean(compute="_compute_is_free_delivery", store=True)
+
+    def init(self):
+        # few lines are free delivery lines, index only them
+        self.env.cr.execute(
+            """
+            CREATE INDEX IF NOT EXISTS sale_order_line_free_delivery_partial_index
+            ON sale_order_line (order_id) WHERE is_free_delivery
+            """
+        )
 
     @api.depends("is_delivery", "currency_id", "price_total")
     def _compute_is_free_delivery(self):
-        for line in self:
-            line.is_free_delivery = line.is_delivery and line.currency_id.is_zero(
-                line.price_total
-            )
+        # price changes of any line trigger this compute, only delivery lines
+        # need their total checked
+        delivery_lines = self.filtered("is_delivery")
+        (self - delivery_lines).is_free_delivery = False
+        for line in delivery_lines:
+            line.is_free_delivery = line.currency_id.is_zero(line.price_total)
 
     @api.depends("is_free_delivery")
     def _get_to_invoice_qty(self):
@@ -58,3 +58,25 @@ class TestDeliveryFreeFeeRemoval(SavepointCase):
         self.assertRecordValues(
             delivery_line, [{"is_free_delivery": True, "qty_to_invoice": 0}]
         )
+
+    def test_remove_free_delivery_lines(self):
+        self.sale.set_delivery_line(self.delivery, 0)
+        self.sale.action_confirm()
+        other_sale = self.sale.copy()
+        other_sale.set_delivery_line(self.delivery, 0)
+        other_sale.action_confirm()
+        other_sale.action_done()
+        self.assertEqual(self.sale.action_remove_free_delivery_lines(), 1)
+        self.assertFalse(self.sale.order_line.filtered("is_delivery"))
+        self.assertEqual(len(self.sale.order_line), 1)
+        self.assertEqual(self.sale.amount_untaxed, 3.0)
+        self.assertFalse(other_sale.action_remove_free_delivery_lines())
+        self.assertTrue(other_sale.order_line.filtered("is_free_delivery"))
+
+    def test_remove_free_delivery_lines_invoice_status(self):
+        self.sale.set_delivery_line(self.delivery, 0)
+        self.sale.action_confirm()
+        self.sale._create_invoices()
+        self.assertEqual(self.sale.invoice_status, "no")
+        self.sale.action_remove_free_delivery_lines()
+        self.assertEqual(self.sale.invoice_status, "invoiced")
@@ -3,7 +3,7 @@
 {
     "name": "Partner Delivery Schedule",
     "summary": "Set on partners a schedule for delivery goods",
-    "version": "13.0.1.0.0",
+    "version": "13.0.1.3.0",
     "development_status": "Production/Stable",
     "category": "Delivery",
     "website": "https://github.com/OCA/delivery-carrier",
@@ -17,5 +17,6 @@
         "views/partner_delivery_schedule_view.xml",
         "views/res_partner_view.xml",
         "views/report_shipping.xml",
+        "views/stock_picking_view.xml",
     ],
 }
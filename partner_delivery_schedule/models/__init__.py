@@ -1,3 +1,7 @@
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+from . import delivery_schedule_slot
+from . import ir_actions_report
 from . import partner_delivery_schedule
 from . import res_partner
+from . import stock_move
+from . import stock_picking
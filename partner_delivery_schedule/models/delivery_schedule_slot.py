@@ -0,0 +1,54 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+from odoo import api, fields, models
+
+
+class DeliveryScheduleSlot(models.Model):
+    """ Deliveries booked in a delivery schedule on a given day
+
+    The booked count is the number of pickings linked to the slot, they are
+    linked while its row is locked, see `delivery.schedule._reserve_slot()`.
+    """
+
+    _name = "delivery.schedule.slot"
+    _description = "Delivery Schedule Slot"
+    _order = "date, schedule_id"
+    _rec_name = "date"
+
+    schedule_id = fields.Many2one(
+        comodel_name="delivery.schedule",
+        string="Delivery Schedule",
+        required=True,
+        ondelete="cascade",
+        index=True,
+    )
+    date = fields.Date(required=True, index=True)
+    capacity = fields.Integer(related="schedule_id.capacity", readonly=True)
+    booked_count = fields.Integer(string="Booked", compute="_compute_booked_count")
+    picking_ids = fields.One2many(
+        comodel_name="stock.picking",
+        inverse_name="delivery_slot_id",
+        string="Transfers",
+        readonly=True,
+    )
+
+    @api.depends("picking_ids.state")
+    def _compute_booked_count(self):
+        groups = self.env["stock.picking"].read_group(
+            [("delivery_slot_id", "in", self.ids), ("state", "!=", "cancel")],
+            ["delivery_slot_id"],
+            ["delivery_slot_id"],
+        )
+        counts = {
+            group["delivery_slot_id"][0]: group["delivery_slot_id_count"]
+            for group in groups
+        }
+        for slot in self:
+            slot.booked_count = counts.get(slot.id, 0)
+
+    _sql_constraints = [
+        (
+            "schedule_date_uniq",
+            "unique(schedule_id, date)",
+            "A delivery schedule can only have one slot per day.",
+        )
+    ]
@@ -0,0 +1,15 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+from odoo import models
+
+
+class IrActionsReport(models.Model):
+    _inherit = "ir.actions.report"
+
+    def _get_rendering_context(self, docids, data):
+        data = super()._get_rendering_context(docids, data)
+        if self.model == "stock.picking" and docids:
+            pickings = self.env["stock.picking"].browse(docids)
+            data[
+                "delivery_schedules_by_picking"
+            ] = pickings._get_report_delivery_schedules()
+        return data
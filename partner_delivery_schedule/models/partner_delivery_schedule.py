@@ -1,7 +1,37 @@
 # Copyright 2018 Tecnativa - Sergio Teruel
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+import json
+import math
+from datetime import timedelta
+
 from odoo import _, api, fields, models
 from odoo.exceptions import ValidationError
+from odoo.osv import expression
+
+WEEKDAYS = (
+    "monday",
+    "tuesday",
+    "wednesday",
+    "thursday",
+    "friday",
+    "saturday",
+    "sunday",
+)
+# fields the weekly bitmaps and display names are built on
+SCHEDULE_FIELDS = ("hour_from", "hour_to") + WEEKDAYS
+# imported day values, True and False also match 1 and 0
+BOOLEAN_VALUES = {
+    True: True,
+    False: False,
+    "1": True,
+    "0": False,
+    "true": True,
+    "false": False,
+    "yes": True,
+    "no": False,
+}
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
 
 
 class DeliverySchedule(models.Model):
@@ -19,35 +49,41 @@ class DeliverySchedule(models.Model):
     friday = fields.Boolean(default=True)
     saturday = fields.Boolean()
     sunday = fields.Boolean()
+    capacity = fields.Integer(
+        help="Maximum number of deliveries that can be booked in this "
+        "schedule per day. Leave 0 for an unlimited capacity.",
+    )
+    display_name_by_lang = fields.Text(
+        compute="_compute_display_name_by_lang",
+        store=True,
+        help="Display names in the installed languages, as JSON.",
+    )
+
+    @api.model
+    def _get_schedule_error(self, values):
+        """ Error message of invalid schedule values, False if they are valid
 
-    @api.constrains("hour_from", "hour_to")
-    def _check_hour_interval(self):
+        :param values: delivery.schedule record or dict with the hours and
+            days values
+        """
         if (
-            self.hour_from < 0.0
-            or self.hour_to > 24.0
-            or self.hour_from >= self.hour_to
+            values["hour_from"] < 0.0
+            or values["hour_to"] > 24.0
+            or values["hour_from"] >= values["hour_to"]
         ):
-            raise ValidationError(
-                _(
-                    "Error ! You can not set hour_from greater or equal "
-                    "than hour_to ."
-                )
+            return _(
+                "Error ! You can not set hour_from greater or equal than hour_to ."
             )
-        return True
+        if not any(values[day] for day in WEEKDAYS):
+            return _("Error ! You must set one day to delivery.")
+        return False
 
-    @api.constrains(
-        "monday",
-        "tuesday",
-        "wednesday",
-        "wednesday",
-        "thursday",
-        "friday",
-        "saturday",
-        "sunday",
-    )
-    def _check_day_selected(self):
-        if not any([self[x[0]] for x in self._days_of_week()]):
-            raise ValidationError(_("Error ! You must set one day to delivery."))
+    @api.constrains(*SCHEDULE_FIELDS)
+    def _check_schedule(self):
+        for schedule in self:
+            error = self._get_schedule_error(schedule)
+            if error:
+                raise ValidationError(error)
         return True
 
     def _days_of_week(self):
@@ -61,25 +97,324 @@ class DeliverySchedule(models.Model):
             ("sunday", _("Sunday")),
         ]
 
+    @api.model
+    def _hour_to_minute(self, hour):
+        """ First minute of the day reached by a float hour """
+        return int(math.ceil(round(hour * 60, 6)))
+
+    @api.model
+    def _get_week_minute(self, date):
+        """ Minute of the week of a datetime, starting on monday 00:00 """
+        return date.weekday() * MINUTES_PER_DAY + date.hour * 60 + date.minute
+
+    @api.model
+    def _compile_weekly_bitmap(self, schedules):
+        """ Compile schedules in a weekly bitmap of allowed minutes
+
+        Bit `_get_week_minute(date)` is set when delivering at `date` is
+        allowed by at least one of the schedules.
+
+        :param schedules: delivery.schedule records or dicts with the
+            hours and days values
+        :return: int
+        """
+        bitmap = 0
+        for schedule in schedules:
+            minute_from = self._hour_to_minute(schedule["hour_from"])
+            minute_to = self._hour_to_minute(schedule["hour_to"])
+            if minute_to <= minute_from:
+                continue
+            slot = (1 << (minute_to - minute_from)) - 1
+            for weekday, day in enumerate(WEEKDAYS):
+                if schedule[day]:
+                    bitmap |= slot << (weekday * MINUTES_PER_DAY + minute_from)
+        return bitmap
+
+    @api.model
+    def _get_next_slot_date(self, bitmap, date):
+        """ First date from `date` allowed by a weekly bitmap
+
+        The next allowed minute is found with bit operations on the bitmap,
+        wrapping to the next week, without iterating over the calendar.
+
+        :return: datetime or False when the bitmap allows no minute
+        """
+        if not bitmap:
+            return False
+        week_minute = self._get_week_minute(date)
+        ahead = bitmap >> week_minute
+        if ahead & 1:
+            return date
+        if ahead:
+            delay = (ahead & -ahead).bit_length() - 1
+        else:
+            delay = MINUTES_PER_WEEK - week_minute
+            delay += (bitmap & -bitmap).bit_length() - 1
+        return date.replace(second=0, microsecond=0) + timedelta(minutes=delay)
+
+    @api.model
+    def _get_schedule_key(self, values):
+        """ Values identifying identical schedules: the first minutes reached
+        by the hours, as the weekly bitmaps do, and the days
+        """
+        return (
+            self._hour_to_minute(values["hour_from"]),
+            self._hour_to_minute(values["hour_to"]),
+            tuple(bool(values[day]) for day in WEEKDAYS),
+        )
+
+    @api.model
+    def _get_hour_domain(self, fname, minutes):
+        """ Domain of the hours that can reach one of the given minutes, with
+        a margin for the float rounding, the keys are compared afterwards
+        """
+        return expression.OR(
+            [
+                [
+                    (fname, ">", (minute - 1) / 60.0 - 1e-6),
+                    (fname, "<=", minute / 60.0 + 1e-6),
+                ]
+                for minute in minutes
+            ]
+        )
+
+    @api.model
+    def _coerce_schedule_values(self, values):
+        """ Convert imported hours to floats and days to booleans, days are
+        given as booleans, 1/0, true/false or yes/no, empty cells are false
+
+        :return: (converted values, error message or False)
+        """
+        values = dict(values)
+        for fname in ("hour_from", "hour_to"):
+            try:
+                values[fname] = float(values[fname])
+            except (TypeError, ValueError):
+                return values, _("Invalid hour: %s.") % (values[fname],)
+        for day in WEEKDAYS:
+            value = values[day]
+            if isinstance(value, str):
+                value = value.strip().lower()
+            if value in BOOLEAN_VALUES:
+                values[day] = BOOLEAN_VALUES[value]
+            elif value in (None, ""):
+                values[day] = False
+            else:
+                return values, _("Invalid day value: %s.") % (values[day],)
+        return values, False
+
+    @api.model
+    def import_delivery_schedules(self, rows):
+        """ Create and link the delivery schedules of many partners at once
+
+        All the rows are validated in a single pass, invalid rows are
+        reported and skipped. Identical schedules (same hours and days) are
+        created once and shared by the partners, existing ones are reused.
+
+        :param rows: list of dicts with a `partner_id`, the hours and days
+            values (missing ones take their default value) and an optional
+            `name` for the schedule
+        :return: dict with the created `schedules` and the `errors` as a list
+            of (row index, message)
+        """
+        defaults = dict.fromkeys(WEEKDAYS, False)
+        defaults["hour_from"] = 0.0
+        defaults.update(self.default_get(list(SCHEDULE_FIELDS)))
+        existing_partner_ids = set(
+            self.env["res.partner"]
+            .browse({row["partner_id"] for row in rows if row.get("partner_id")})
+            .exists()
+            .ids
+        )
+        errors = []
+        partner_ids_by_key = {}
+        name_by_key = {}
+        for index, row in enumerate(rows):
+            values, error = self._coerce_schedule_values(dict(defaults, **row))
+            if not error:
+                error = self._get_schedule_error(values)
+            if row.get("partner_id") not in existing_partner_ids:
+                error = _("Partner not found.")
+            if error:
+                errors.append((index, error))
+                continue
+            key = self._get_schedule_key(values)
+            partner_ids_by_key.setdefault(key, set()).add(row["partner_id"])
+            if not name_by_key.get(key):
+                name_by_key[key] = row.get("name")
+        schedule_by_key = {}
+        # only the schedules with the imported hours can be identical
+        candidates = self.browse()
+        if partner_ids_by_key:
+            candidates = self.search(
+                expression.AND(
+                    [
+                        self._get_hour_domain(
+                            "hour_from", {key[0] for key in partner_ids_by_key}
+                        ),
+                        self._get_hour_domain(
+                            "hour_to", {key[1] for key in partner_ids_by_key}
+                        ),
+                    ]
+                )
+            )
+        for schedule in candidates:
+            schedule_by_key.setdefault(self._get_schedule_key(schedule), schedule)
+        new_keys = [key for key in partner_ids_by_key if key not in schedule_by_key]
+        vals_list = []
+        for key in new_keys:
+            minute_from, minute_to, days = key
+            vals = dict(
+                zip(WEEKDAYS, days),
+                hour_from=minute_from / 60.0,
+                hour_to=minute_to / 60.0,
+            )
+            vals["name"] = (
+                name_by_key[key] or self.new(vals)._format_schedule_display_name()
+            )
+            vals_list.append(vals)
+        schedules = self.create(vals_list)
+        schedule_by_key.update(zip(new_keys, schedules))
+        partner_obj = self.env["res.partner"]
+        for key, partner_ids in partner_ids_by_key.items():
+            partner_obj.browse(partner_ids).write(
+                {"delivery_schedule_ids": [(4, schedule_by_key[key].id)]}
+            )
+        return {"schedules": schedules, "errors": errors}
+
+    def _get_slot_id(self, date):
+        """ Id of the schedule slot of a day, None if it doesn't exist """
+        self.env.cr.execute(
+            "SELECT id FROM delivery_schedule_slot WHERE schedule_id = %s AND date = %s",
+            (self.id, date),
+        )
+        row = self.env.cr.fetchone()
+        return row and row[0]
+
+    def _reserve_slot(self, date):
+        """ Lock the schedule slot of a day and check it can take one more
+        delivery
+
+        The slot is created if needed. With a capacity, it is updated to
+        lock its row until the end of the transaction: a concurrent
+        reservation of the same slot waits, then fails with a serialization
+        error and is retried, so the deliveries booked can't exceed the
+        capacity. Slots without capacity aren't locked. The caller must link
+        the picking to the slot in the same transaction.
+
+        :param date: date of the slot
+        :return: the delivery.schedule.slot or False when it is full
+        """
+        self.ensure_one()
+        slot_obj = self.env["delivery.schedule.slot"]
+        slot_id = self._get_slot_id(date)
+        if slot_id and not self.capacity:
+            return slot_obj.browse(slot_id)
+        if not slot_id:
+            self.env.cr.execute(
+                """
+                INSERT INTO delivery_schedule_slot (
+                    schedule_id, date, create_uid, create_date, write_uid, write_date
+                )
+                VALUES (
+                    %(schedule_id)s, %(date)s,
+                    %(uid)s, NOW() AT TIME ZONE 'UTC',
+                    %(uid)s, NOW() AT TIME ZONE 'UTC'
+                )
+                ON CONFLICT (schedule_id, date) DO NOTHING
+                """,
+                {"schedule_id": self.id, "date": date, "uid": self.env.uid},
+            )
+            if not self.capacity:
+                return slot_obj.browse(self._get_slot_id(date))
+        self.env.cr.execute(
+            """
+            UPDATE delivery_schedule_slot
+            SET write_uid = %s, write_date = NOW() AT TIME ZONE 'UTC'
+            WHERE schedule_id = %s AND date = %s
+            RETURNING id
+            """,
+            (self.env.uid, self.id, date),
+        )
+        slot = slot_obj.browse(self.env.cr.fetchone()[0])
+        slot.invalidate_cache()
+        if slot.booked_count >= self.capacity:
+            return False
+        return slot
+
+    def get_free_capacity(self, date_from, date_to):
+        """ Deliveries that can still be booked per schedule and day
+
+        Schedules without capacity are unlimited and not returned.
+
+        :return: {(schedule_id, date): free capacity}
+        """
+        schedules = self.filtered("capacity")
+        if not schedules:
+            return {}
+        date_from = fields.Date.to_date(date_from)
+        date_to = fields.Date.to_date(date_to)
+        booked = {
+            (slot["schedule_id"][0], slot["date"]): slot["booked_count"]
+            for slot in self.env["delivery.schedule.slot"].search_read(
+                [
+                    ("schedule_id", "in", schedules.ids),
+                    ("date", ">=", date_from),
+                    ("date", "<=", date_to),
+                ],
+                ["schedule_id", "date", "booked_count"],
+            )
+        }
+        result = {}
+        for day in range((date_to - date_from).days + 1):
+            date = date_from + timedelta(days=day)
+            weekday = WEEKDAYS[date.weekday()]
+            for schedule in schedules.filtered(weekday):
+                result[(schedule.id, date)] = max(
+                    schedule.capacity - booked.get((schedule.id, date), 0), 0
+                )
+        return result
+
+    def _format_schedule_display_name(self):
+        self.ensure_one()
+        hour_from = "{:02.0f}:{:02.0f}".format(*divmod(self.hour_from * 60, 60))
+        hour_to = "{:02.0f}:{:02.0f}".format(*divmod(self.hour_to * 60, 60))
+        days_accepted = [d[1][:2] for d in self._days_of_week() if self[d[0]]]
+        days = (
+            days_accepted
+            and len(days_accepted) > 0
+            and len(days_accepted) < 7
+            and ", ".join(days_accepted)
+            or _("All days")
+        )
+        return "{hour_from}-{hour_to} ({days})".format(
+            hour_from=hour_from, hour_to=hour_to, days=days
+        )
+
+    @api.depends(*SCHEDULE_FIELDS)
+    def _compute_display_name_by_lang(self):
+        langs = [code for code, __ in self.env["res.lang"].get_installed()]
+        for schedule in self:
+            names = {}
+            for lang in langs:
+                localized = schedule.with_context(lang=lang)
+                names[lang] = localized._format_schedule_display_name()
+            schedule.display_name_by_lang = json.dumps(names)
+
+    @api.depends(*SCHEDULE_FIELDS)
+    def _compute_display_name(self):
+        return super()._compute_display_name()
+
     def name_get(self):
+        # the names of languages installed after the last change of the
+        # schedule aren't stored, they are formatted on the fly
         result = []
         for schedule in self:
-            hour_from = "{:02.0f}:{:02.0f}".format(*divmod(schedule.hour_from * 60, 60))
-            hour_to = "{:02.0f}:{:02.0f}".format(*divmod(schedule.hour_to * 60, 60))
-            days_accepted = [d[1][:2] for d in self._days_of_week() if schedule[d[0]]]
-            days = (
-                days_accepted
-                and len(days_accepted) > 0
-                and len(days_accepted) < 7
-                and ", ".join(days_accepted)
-                or _("All days")
-            )
+            name = False
+            if not isinstance(schedule.id, models.NewId):
+                names = json.loads(schedule.display_name_by_lang or "{}")
+                name = names.get(self.env.lang or "en_US")
             result.append(
-                (
-                    schedule.id,
-                    "{hour_from}-{hour_to} ({days})".format(
-                        hour_from=hour_from, hour_to=hour_to, days=days
-                    ),
-                )
+                (schedule.id, name or schedule._format_schedule_display_name())
             )
         return result
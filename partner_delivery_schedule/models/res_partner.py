@@ -1,6 +1,8 @@
 # Copyright 2018 Tecnativa - Sergio Teruel
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
-from odoo import fields, models
+from odoo import api, fields, models
+
+from .partner_delivery_schedule import SCHEDULE_FIELDS
 
 
 class ResPartner(models.Model):
@@ -12,21 +14,115 @@ class ResPartner(models.Model):
         column2="delivery_schedule_id",
         string="Delivery Schedule",
     )
+    delivery_schedule_auto_shift = fields.Boolean(
+        string="Shift Deliveries to Schedule",
+        help="When the deliveries of this partner are confirmed, move their "
+        "scheduled date to the next slot allowed by the delivery schedule.",
+    )
+
+    delivery_schedule_bitmap = fields.Char(
+        compute="_compute_delivery_schedule_bitmap",
+        store=True,
+        help="Weekly bitmap of the minutes the partner accepts deliveries, "
+        "in hexadecimal.",
+    )
+
+    @api.depends(*["delivery_schedule_ids.%s" % fname for fname in SCHEDULE_FIELDS])
+    def _compute_delivery_schedule_bitmap(self):
+        schedule_obj = self.env["delivery.schedule"]
+        for partner in self:
+            bitmap = schedule_obj._compile_weekly_bitmap(partner.delivery_schedule_ids)
+            partner.delivery_schedule_bitmap = "%x" % bitmap if bitmap else False
+
+    def _get_delivery_schedule_bitmap(self):
+        """ Weekly bitmap of the minutes the partner accepts deliveries """
+        self.ensure_one()
+        return int(self.delivery_schedule_bitmap or "0", 16)
+
+    def _get_delivery_schedule_bitmaps(self):
+        """ Weekly bitmaps of all the partners, read with their stored value
+
+        :return: {partner_id: bitmap}
+        """
+        return {partner.id: partner._get_delivery_schedule_bitmap() for partner in self}
+
+    def allow_delivery_dates(self, dates):
+        """
+        Batch version of `allow_delivery_date` checking every partner of the
+        recordset against every date
+
+        :param dates: list of datetimes or datetime strings
+        :return: {partner_id: [allowed for each date]}
+        """
+        schedule_obj = self.env["delivery.schedule"]
+        week_minutes = [
+            schedule_obj._get_week_minute(fields.Datetime.to_datetime(date))
+            for date in dates
+        ]
+        return {
+            partner_id: [bool(bitmap >> minute & 1) for minute in week_minutes]
+            for partner_id, bitmap in self._get_delivery_schedule_bitmaps().items()
+        }
+
+    @api.model
+    def allow_delivery_date_pairs(self, pairs):
+        """
+        Batch version of `allow_delivery_date` for (partner, date) pairs
+
+        :param pairs: list of (partner_id, datetime or datetime string)
+        :return: list of allowed for each pair
+        """
+        schedule_obj = self.env["delivery.schedule"]
+        partners = self.browse({partner_id for partner_id, __ in pairs})
+        bitmaps = partners._get_delivery_schedule_bitmaps()
+        return [
+            bool(
+                bitmaps[partner_id]
+                >> schedule_obj._get_week_minute(fields.Datetime.to_datetime(date))
+                & 1
+            )
+            for partner_id, date in pairs
+        ]
+
+    def _get_merged_delivery_schedule_bitmap(self):
+        """ Weekly bitmap of the minutes any of the partners accepts
+        deliveries
+        """
+        bitmap = 0
+        for partner in self:
+            bitmap |= partner._get_delivery_schedule_bitmap()
+        return bitmap
 
     def allow_delivery_date(self, date_str):
         """
         Help method that returns if a partner allow delivery goods in
         requested date (with time)
         """
-        day_list = self.env["delivery.schedule"]._days_of_week()
-        date = fields.Datetime.from_string(date_str)
-        week_day = day_list[date.weekday()][0]
-        request_delivery_hour = int(date.hour) + float(date.minute / 60)
-        delivery_records = self.delivery_schedule_ids.filtered(
-            lambda x: (
-                x[week_day]
-                and request_delivery_hour >= x.hour_from
-                and request_delivery_hour < x.hour_to
-            )
+        date = fields.Datetime.to_datetime(date_str)
+        bitmap = self._get_merged_delivery_schedule_bitmap()
+        week_minute = self.env["delivery.schedule"]._get_week_minute(date)
+        return bool(bitmap >> week_minute & 1)
+
+    def next_delivery_slot(self, after_datetime):
+        """
+        Return the first datetime from `after_datetime` (included) at which
+        the partner allows delivering goods, or False if it has no delivery
+        schedule
+        """
+        return self.env["delivery.schedule"]._get_next_slot_date(
+            self._get_merged_delivery_schedule_bitmap(),
+            fields.Datetime.to_datetime(after_datetime),
         )
-        return bool(delivery_records)
+
+    def next_delivery_slots(self, after_datetime):
+        """
+        Batch version of `next_delivery_slot`
+
+        :return: {partner_id: next allowed datetime or False}
+        """
+        schedule_obj = self.env["delivery.schedule"]
+        date = fields.Datetime.to_datetime(after_datetime)
+        return {
+            partner_id: schedule_obj._get_next_slot_date(bitmap, date)
+            for partner_id, bitmap in self._get_delivery_schedule_bitmaps().items()
+        }
@@ -0,0 +1,20 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+from odoo import models
+
+
+class StockMove(models.Model):
+    _inherit = "stock.move"
+
+    def _action_confirm(self, merge=True, merge_into=False):
+        moves = super()._action_confirm(merge=merge, merge_into=merge_into)
+        moves.mapped("picking_id").filtered(
+            lambda p: p._get_delivery_schedule_partner().delivery_schedule_auto_shift
+        )._shift_to_delivery_schedule()
+        return moves
+
+    def write(self, vals):
+        res = super().write(vals)
+        if "date_expected" in vals:
+            # the scheduled date of the pickings is computed from their moves
+            self.mapped("picking_id")._rebook_delivery_slot()
+        return res
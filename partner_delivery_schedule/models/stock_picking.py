@@ -0,0 +1,235 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+from collections import defaultdict
+
+from odoo import _, api, fields, models
+from odoo.exceptions import UserError
+
+import pytz
+
+# the schedule and time zone of a delivery address, or of the commercial
+# partner
+SCHEDULE_DEPENDS = [
+    "partner_id.delivery_schedule_bitmap",
+    "partner_id.tz",
+    "partner_id.commercial_partner_id.delivery_schedule_bitmap",
+    "partner_id.commercial_partner_id.tz",
+]
+
+
+class StockPicking(models.Model):
+    _inherit = "stock.picking"
+
+    delivery_schedule_compliant = fields.Boolean(
+        string="In Delivery Schedule",
+        compute="_compute_delivery_schedule_compliant",
+        store=True,
+        index=True,
+        help="The scheduled date of this delivery falls in the delivery "
+        "schedule of the customer.",
+    )
+    delivery_slot_id = fields.Many2one(
+        comodel_name="delivery.schedule.slot",
+        string="Delivery Slot",
+        readonly=True,
+        copy=False,
+        index=True,
+    )
+
+    def _get_delivery_schedule_partner(self):
+        """ Partner whose delivery schedule applies to the picking """
+        self.ensure_one()
+        partner = self.partner_id
+        return partner if partner.type == "delivery" else partner.commercial_partner_id
+
+    def _get_delivery_schedule_tz(self):
+        """ Time zone of the delivery schedule hours: the customer's one, or
+        the company's one if it has none, UTC otherwise. It doesn't depend on
+        the current user, the compliance of the pickings is stored.
+        """
+        self.ensure_one()
+        return (
+            self._get_delivery_schedule_partner().tz
+            or self.company_id.partner_id.tz
+            or "UTC"
+        )
+
+    def _get_local_scheduled_date(self):
+        """ Scheduled date in the time zone of the delivery schedule, as a
+        naive datetime comparable with the schedule hours
+        """
+        self.ensure_one()
+        picking = self.with_context(tz=self._get_delivery_schedule_tz())
+        return fields.Datetime.context_timestamp(picking, self.scheduled_date).replace(
+            tzinfo=None
+        )
+
+    def _get_utc_date(self, local_date):
+        """ UTC naive datetime of a date in the delivery schedule time zone """
+        self.ensure_one()
+        tz = pytz.timezone(self._get_delivery_schedule_tz())
+        return tz.localize(local_date).astimezone(pytz.utc).replace(tzinfo=None)
+
+    @api.depends(
+        "company_id.partner_id.tz",
+        "picking_type_id.code",
+        "scheduled_date",
+        "partner_id.type",
+        *SCHEDULE_DEPENDS
+    )
+    def _compute_delivery_schedule_compliant(self):
+        schedule_obj = self.env["delivery.schedule"]
+        for picking in self:
+            if not (
+                picking.picking_type_id.code == "outgoing"
+                and picking.partner_id
+                and picking.scheduled_date
+            ):
+                picking.delivery_schedule_compliant = False
+                continue
+            bitmap = (
+                picking._get_delivery_schedule_partner()._get_delivery_schedule_bitmap()
+            )
+            week_minute = schedule_obj._get_week_minute(
+                picking._get_local_scheduled_date()
+            )
+            picking.delivery_schedule_compliant = bool(bitmap >> week_minute & 1)
+
+    def _get_report_delivery_schedules(self):
+        """ Delivery schedules printed on each outgoing picking
+
+        The partners, schedules and display names of all the pickings are
+        loaded at once instead of picking by picking in the report loop.
+
+        :return: {picking_id: delivery.schedule records}
+        """
+        pickings = self.filtered(
+            lambda p: p.picking_type_id.code == "outgoing" and p.partner_id
+        )
+        partner_by_picking = {
+            picking.id: picking._get_delivery_schedule_partner() for picking in pickings
+        }
+        partners = self.env["res.partner"].union(*partner_by_picking.values())
+        partners.mapped("delivery_schedule_ids").name_get()
+        return {
+            picking_id: partner.delivery_schedule_ids
+            for picking_id, partner in partner_by_picking.items()
+        }
+
+    def _shift_to_delivery_schedule(self):
+        """ Move the scheduled date of the outgoing pickings to the next slot
+        allowed by the delivery schedule of their customer
+
+        The schedules of all the customers are read at once and the pickings
+        moved to the same date are written together.
+        """
+        pickings = self.filtered(
+            lambda p: p.picking_type_id.code == "outgoing"
+            and p.partner_id
+            and p.scheduled_date
+            and p.state not in ("done", "cancel")
+        )
+        partner_by_picking = {
+            picking: picking._get_delivery_schedule_partner() for picking in pickings
+        }
+        partners = self.env["res.partner"].union(*partner_by_picking.values())
+        bitmaps = partners._get_delivery_schedule_bitmaps()
+        schedule_obj = self.env["delivery.schedule"]
+        picking_ids_by_date = defaultdict(list)
+        for picking, partner in partner_by_picking.items():
+            local_date = picking._get_local_scheduled_date()
+            date = schedule_obj._get_next_slot_date(bitmaps[partner.id], local_date)
+            if date and date != local_date:
+                picking_ids_by_date[picking._get_utc_date(date)].append(picking.id)
+        for date, picking_ids in picking_ids_by_date.items():
+            self.browse(picking_ids).write({"scheduled_date": date})
+
+    def action_shift_to_delivery_schedule(self):
+        self._shift_to_delivery_schedule()
+        return True
+
+    def _reserve_delivery_slot(self, raise_if_full=True):
+        """ Book the open outgoing pickings in a slot of the delivery
+        schedules of their customer allowing their scheduled date
+
+        :param raise_if_full: raise when no slot is available, otherwise
+            leave the picking without slot
+        """
+        schedule_obj = self.env["delivery.schedule"]
+        for picking in self:
+            if (
+                picking.delivery_slot_id
+                or not picking.scheduled_date
+                or picking.picking_type_code != "outgoing"
+                or picking.state in ("done", "cancel")
+            ):
+                continue
+            local_date = picking._get_local_scheduled_date()
+            week_minute = schedule_obj._get_week_minute(local_date)
+            schedules = picking._get_delivery_schedule_partner().delivery_schedule_ids
+            slot = False
+            for schedule in schedules:
+                if not schedule_obj._compile_weekly_bitmap(schedule) >> week_minute & 1:
+                    continue
+                slot = schedule._reserve_slot(local_date.date())
+                if slot:
+                    break
+            if slot:
+                picking.delivery_slot_id = slot
+            elif raise_if_full:
+                raise UserError(
+                    _("No delivery slot available for %s on %s.")
+                    % (picking.name, local_date)
+                )
+
+    def _release_delivery_slot(self):
+        """ Free the slots booked by the pickings """
+        self.filtered("delivery_slot_id").write({"delivery_slot_id": False})
+
+    def _is_delivery_slot_valid(self):
+        """ Whether the booked slot still matches the scheduled date """
+        self.ensure_one()
+        if not self.scheduled_date:
+            return False
+        local_date = self._get_local_scheduled_date()
+        slot = self.delivery_slot_id
+        schedule_obj = self.env["delivery.schedule"]
+        return (
+            slot.date == local_date.date()
+            and schedule_obj._compile_weekly_bitmap(slot.schedule_id)
+            >> schedule_obj._get_week_minute(local_date)
+            & 1
+        )
+
+    def _rebook_delivery_slot(self, force=False):
+        """ Book again the pickings whose slot doesn't match their scheduled
+        date anymore, or all the booked ones with `force`
+        """
+        pickings = self.filtered("delivery_slot_id")
+        if not force:
+            pickings = pickings.filtered(lambda p: not p._is_delivery_slot_valid())
+        if pickings:
+            pickings._release_delivery_slot()
+            pickings._reserve_delivery_slot(raise_if_full=False)
+
+    def write(self, vals):
+        res = super().write(vals)
+        # the booked slot depends on the date and the customer schedule, the
+        # date changing through the moves is handled by them
+        if "partner_id" in vals:
+            self._rebook_delivery_slot(force=True)
+        elif "scheduled_date" in vals:
+            self._rebook_delivery_slot()
+        return res
+
+    def action_reserve_delivery_slot(self):
+        self._reserve_delivery_slot()
+        return True
+
+    def action_release_delivery_slot(self):
+        self._release_delivery_slot()
+        return True
+
+    def action_cancel(self):
+        res = super().action_cancel()
+        self._release_delivery_slot()
+        return res
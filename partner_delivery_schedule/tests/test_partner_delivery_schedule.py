@@ -1,6 +1,9 @@
 # Copyright 2018 Tecnativa - Sergio Teruel
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
-from odoo.exceptions import ValidationError
+import json
+from datetime import date, datetime
+
+from odoo.exceptions import UserError, ValidationError
 from odoo.tests import SavepointCase
 
 
@@ -38,6 +41,7 @@ class TestStockPikingReturnRefundOption(SavepointCase):
         cls.partner = cls.env["res.partner"].create(
             {
                 "name": "test",
+                "tz": "UTC",
                 "delivery_schedule_ids": [(6, 0, cls.schedule.ids + cls.schedule2.ids)],
             }
         )
@@ -50,6 +54,12 @@ class TestStockPikingReturnRefundOption(SavepointCase):
             day_update[day[0]] = True
         self.schedule.update(day_update)
         self.assertEqual(self.schedule.name_get()[0][1], "08:00-10:00 (All days)")
+        self.schedule.hour_to = 10.5
+        self.assertEqual(self.schedule.display_name, "08:00-10:30 (All days)")
+        self.assertEqual(
+            json.loads(self.schedule.display_name_by_lang)["en_US"],
+            "08:00-10:30 (All days)",
+        )
 
         with self.assertRaises(ValidationError):
             self.schedule.update({"hour_from": 0, "hour_to": 25})
@@ -72,3 +82,286 @@ class TestStockPikingReturnRefundOption(SavepointCase):
             day_update[day[0]] = True
         self.schedule.update(day_update)
         self.assertTrue(self.partner.allow_delivery_date("2018-09-09 09:00:00"))
+
+    def test_partner_allow_delivery_minutes(self):
+        self.schedule.write({"hour_from": 8.5, "hour_to": 9.75})
+        self.assertFalse(self.partner.allow_delivery_date("2018-09-03 08:29:59"))
+        self.assertTrue(self.partner.allow_delivery_date("2018-09-03 08:30:00"))
+        self.assertTrue(self.partner.allow_delivery_date("2018-09-03 09:44:00"))
+        self.assertFalse(self.partner.allow_delivery_date("2018-09-03 09:45:00"))
+        self.assertTrue(self.partner.allow_delivery_date("2018-09-03 11:59:00"))
+        self.partner.delivery_schedule_ids = [(3, self.schedule2.id)]
+        self.assertFalse(self.partner.allow_delivery_date("2018-09-03 11:59:00"))
+        self.assertFalse(
+            self.env["res.partner"].allow_delivery_date("2018-09-03 09:00")
+        )
+
+    def test_partner_allow_delivery_batch(self):
+        partner2 = self.env["res.partner"].create(
+            {"name": "test2", "delivery_schedule_ids": [(6, 0, self.schedule2.ids)]}
+        )
+        partners = self.partner | partner2
+        dates = ["2018-09-03 09:00:00", "2018-09-04 11:00:00", "2018-09-05 09:00:00"]
+        self.assertEqual(
+            partners.allow_delivery_dates(dates),
+            {self.partner.id: [True, True, False], partner2.id: [False, True, False]},
+        )
+        pairs = [(partner.id, date) for partner in partners for date in dates]
+        self.assertEqual(
+            self.env["res.partner"].allow_delivery_date_pairs(pairs),
+            [
+                partner.allow_delivery_date(date)
+                for partner in partners
+                for date in dates
+            ],
+        )
+
+    def test_partner_next_delivery_slot(self):
+        partner = self.partner
+        self.assertEqual(
+            partner.next_delivery_slot("2018-09-03 09:30:15"),
+            datetime(2018, 9, 3, 9, 30, 15),
+        )
+        self.assertEqual(
+            partner.next_delivery_slot("2018-09-03 06:10:15"),
+            datetime(2018, 9, 3, 8, 0),
+        )
+        # Tuesday evening, next slot is next monday morning
+        self.assertEqual(
+            partner.next_delivery_slot("2018-09-04 12:00:00"),
+            datetime(2018, 9, 10, 8, 0),
+        )
+        # Sunday evening, the next slot wraps to the next week
+        self.assertEqual(
+            partner.next_delivery_slot("2018-09-09 23:59:00"),
+            datetime(2018, 9, 10, 8, 0),
+        )
+        partner2 = self.env["res.partner"].create({"name": "test2"})
+        self.assertFalse(partner2.next_delivery_slot("2018-09-03 09:00:00"))
+        self.assertEqual(
+            (partner | partner2).next_delivery_slots("2018-09-04 12:00:00"),
+            {partner.id: datetime(2018, 9, 10, 8, 0), partner2.id: False},
+        )
+
+    def _create_picking(self, partner, date):
+        picking_type = self.env.ref("stock.picking_type_out")
+        product = self.env["product.product"].create({"name": "test", "type": "consu"})
+        location = picking_type.default_location_src_id
+        location_dest = self.env.ref("stock.stock_location_customers")
+        return self.env["stock.picking"].create(
+            {
+                "partner_id": partner.id,
+                "picking_type_id": picking_type.id,
+                "location_id": location.id,
+                "location_dest_id": location_dest.id,
+                "scheduled_date": date,
+                "move_lines": [
+                    (
+                        0,
+                        0,
+                        {
+                            "name": product.name,
+                            "product_id": product.id,
+                            "product_uom": product.uom_id.id,
+                            "product_uom_qty": 1,
+                            "location_id": location.id,
+                            "location_dest_id": location_dest.id,
+                            "date_expected": date,
+                        },
+                    )
+                ],
+            }
+        )
+
+    def test_picking_delivery_schedule_compliant(self):
+        contact = self.env["res.partner"].create(
+            {"name": "contact", "type": "contact", "parent_id": self.partner.id}
+        )
+        picking = self._create_picking(contact, "2018-09-03 09:00:00")
+        self.assertTrue(picking.delivery_schedule_compliant)
+        picking.scheduled_date = "2018-09-05 09:00:00"
+        self.assertFalse(picking.delivery_schedule_compliant)
+        self.schedule.wednesday = True
+        self.assertTrue(picking.delivery_schedule_compliant)
+        self.partner.delivery_schedule_ids = [(3, self.schedule.id)]
+        self.assertFalse(picking.delivery_schedule_compliant)
+        self.assertFalse(
+            self.env["stock.picking"].search(
+                [("id", "=", picking.id), ("delivery_schedule_compliant", "=", True)]
+            )
+        )
+
+    def test_picking_shift_to_delivery_schedule(self):
+        picking = self._create_picking(self.partner, "2018-09-05 09:00:00")
+        picking.action_confirm()
+        self.assertEqual(picking.scheduled_date, datetime(2018, 9, 5, 9, 0))
+        picking.action_shift_to_delivery_schedule()
+        self.assertEqual(picking.scheduled_date, datetime(2018, 9, 10, 8, 0))
+        self.assertTrue(picking.delivery_schedule_compliant)
+        self.partner.delivery_schedule_auto_shift = True
+        picking = self._create_picking(self.partner, "2018-09-04 12:30:00")
+        picking.action_confirm()
+        self.assertEqual(picking.scheduled_date, datetime(2018, 9, 10, 8, 0))
+
+    def test_picking_delivery_schedule_tz(self):
+        # schedule hours are local, Madrid is UTC+2 in September
+        partner = self.env["res.partner"].create(
+            {
+                "name": "Madrid",
+                "tz": "Europe/Madrid",
+                "delivery_schedule_ids": [(6, 0, self.schedule.ids)],
+            }
+        )
+        picking = self._create_picking(partner, "2018-09-03 06:30:00")
+        self.assertTrue(picking.delivery_schedule_compliant)
+        picking.scheduled_date = "2018-09-03 09:00:00"
+        self.assertFalse(picking.delivery_schedule_compliant)
+        # tuesday 23:30 UTC is wednesday in Madrid, next slot next monday
+        picking.scheduled_date = "2018-09-04 23:30:00"
+        picking.action_shift_to_delivery_schedule()
+        self.assertEqual(picking.scheduled_date, datetime(2018, 9, 10, 6, 0))
+        self.assertTrue(picking.delivery_schedule_compliant)
+        # sunday 22:30 UTC is monday 00:30 in Madrid, booked on monday
+        self.schedule.hour_from = 0
+        picking.scheduled_date = "2018-09-09 22:30:00"
+        picking.action_reserve_delivery_slot()
+        self.assertEqual(picking.delivery_slot_id.date, date(2018, 9, 10))
+
+    def test_picking_delivery_schedule_tz_fallback(self):
+        # without customer nor company time zone the hours are UTC, whatever
+        # the time zone of the user
+        partner = self.env["res.partner"].create(
+            {"name": "No tz", "delivery_schedule_ids": [(6, 0, self.schedule.ids)]}
+        )
+        self.env.user.company_id.partner_id.tz = False
+        self.env.user.tz = "Europe/Madrid"
+        picking = self._create_picking(partner, "2018-09-03 09:00:00")
+        self.assertTrue(picking.delivery_schedule_compliant)
+        self.env.user.company_id.partner_id.tz = "Europe/Madrid"
+        self.assertFalse(picking.delivery_schedule_compliant)
+
+    def test_report_delivery_schedules(self):
+        picking = self._create_picking(self.partner, "2018-09-03 09:00:00")
+        report = self.env.ref("stock.action_report_delivery")
+        data = report._get_rendering_context(picking.ids, {})
+        self.assertEqual(
+            data["delivery_schedules_by_picking"],
+            {picking.id: self.partner.delivery_schedule_ids},
+        )
+        html = report.render_qweb_html(picking.ids)[0]
+        self.assertIn(b"08:00-10:00 (Mo, Tu)", html)
+
+    def test_import_delivery_schedules(self):
+        partner2 = self.env["res.partner"].create({"name": "test2"})
+        rows = [
+            {
+                "partner_id": partner2.id,
+                "hour_from": 8,
+                "hour_to": 10,
+                "monday": True,
+                "tuesday": True,
+                "wednesday": False,
+                "thursday": False,
+                "friday": False,
+            },
+            {"partner_id": partner2.id, "hour_from": 14, "hour_to": 18},
+            {"partner_id": self.partner.id, "hour_from": 14, "hour_to": 18},
+            {"partner_id": partner2.id, "hour_from": 18, "hour_to": 14},
+            {
+                "partner_id": partner2.id,
+                "monday": False,
+                "tuesday": False,
+                "wednesday": False,
+                "thursday": False,
+                "friday": False,
+            },
+            {"partner_id": 0, "hour_from": 14, "hour_to": 18},
+            {"partner_id": partner2.id, "hour_from": "eight", "hour_to": 18},
+            {"partner_id": partner2.id, "hour_from": None, "hour_to": 18},
+            {"partner_id": partner2.id, "hour_from": "14", "hour_to": "18.0"},
+            {"partner_id": partner2.id, "hour_from": 14, "hour_to": 18, "sunday": "?"},
+            {
+                "partner_id": partner2.id,
+                "hour_from": 14,
+                "hour_to": 18,
+                "saturday": "No",
+                "sunday": "0",
+            },
+            # 08:20 entered with the float_time widget
+            {
+                "partner_id": partner2.id,
+                "hour_from": "8.3333",
+                "hour_to": 10,
+                "wednesday": "false",
+                "thursday": "false",
+                "friday": "false",
+            },
+        ]
+        schedule_0820 = self.schedule.copy({"hour_from": 8 + 1 / 3.0})
+        result = self.env["delivery.schedule"].import_delivery_schedules(rows)
+        self.assertEqual([index for index, __ in result["errors"]], [3, 4, 5, 6, 7, 9])
+        new_schedule = result["schedules"]
+        self.assertEqual(len(new_schedule), 1)
+        self.assertEqual(new_schedule.display_name, "14:00-18:00 (Mo, Tu, We, Th, Fr)")
+        self.assertEqual(
+            partner2.delivery_schedule_ids,
+            self.schedule | new_schedule | schedule_0820,
+        )
+        self.assertIn(new_schedule, self.partner.delivery_schedule_ids)
+
+    def test_delivery_slot_capacity(self):
+        self.schedule.capacity = 1
+        picking = self._create_picking(self.partner, "2018-09-03 09:00:00")
+        picking2 = self._create_picking(self.partner, "2018-09-03 09:30:00")
+        picking.action_reserve_delivery_slot()
+        slot = picking.delivery_slot_id
+        self.assertEqual(slot.schedule_id, self.schedule)
+        self.assertEqual(slot.booked_count, 1)
+        self.assertEqual(
+            self.schedule.get_free_capacity("2018-09-03", "2018-09-04"),
+            {
+                (self.schedule.id, date(2018, 9, 3)): 0,
+                (self.schedule.id, date(2018, 9, 4)): 1,
+            },
+        )
+        with self.assertRaises(UserError):
+            picking2.action_reserve_delivery_slot()
+        picking.action_cancel()
+        self.assertFalse(picking.delivery_slot_id)
+        self.assertEqual(slot.booked_count, 0)
+        picking2.action_reserve_delivery_slot()
+        self.assertEqual(picking2.delivery_slot_id, slot)
+        self.assertEqual(slot.booked_count, 1)
+
+    def test_delivery_slot_unlimited(self):
+        picking = self._create_picking(self.partner, "2018-09-03 09:00:00")
+        picking2 = self._create_picking(self.partner, "2018-09-03 09:30:00")
+        (picking | picking2).action_reserve_delivery_slot()
+        self.assertEqual(picking.delivery_slot_id, picking2.delivery_slot_id)
+        self.assertEqual(picking.delivery_slot_id.booked_count, 2)
+
+    def test_delivery_slot_rebook(self):
+        self.schedule.capacity = 1
+        picking = self._create_picking(self.partner, "2018-09-03 09:00:00")
+        picking.action_reserve_delivery_slot()
+        slot = picking.delivery_slot_id
+        # moving the picking moves its booking to the slot of the new date
+        picking.scheduled_date = "2018-09-04 09:00:00"
+        self.assertEqual(picking.delivery_slot_id.date, date(2018, 9, 4))
+        self.assertEqual(slot.booked_count, 0)
+        new_slot = picking.delivery_slot_id
+        picking2 = self._create_picking(self.partner, "2018-09-03 09:30:00")
+        picking2.action_reserve_delivery_slot()
+        self.assertEqual(picking2.delivery_slot_id, slot)
+        # a deleted picking doesn't keep its booking
+        picking.unlink()
+        self.assertEqual(new_slot.booked_count, 0)
+        # the date changing through the moves moves the booking too
+        picking2.move_lines.date_expected = "2018-09-04 09:30:00"
+        self.assertEqual(picking2.delivery_slot_id, new_slot)
+        self.assertEqual(slot.booked_count, 0)
+        # only outgoing pickings are booked
+        incoming = self._create_picking(self.partner, "2018-09-04 09:00:00")
+        incoming.picking_type_id = self.env.ref("stock.picking_type_in")
+        incoming.action_reserve_delivery_slot()
+        self.assertFalse(incoming.delivery_slot_id)
@@ -3,7 +3,7 @@
 {
     "name": "Partner Delivery Zone",
     "summary": "Set on partners a zone for delivery goods",
-    "version": "13.0.1.0.1",
+    "version": "13.0.1.1.0",
     "development_status": "Beta",
     "category": "Delivery",
     "website": "https://github.com/OCA/delivery-carrier",
@@ -12,6 +12,7 @@
     "application": False,
     "installable": True,
     "depends": ["sale_stock"],
+    "pre_init_hook": "pre_init_hook",
     "data": [
         "security/ir.model.access.csv",
         "views/partner_delivery_zone_view.xml",
@@ -0,0 +1,105 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# number of ids updated by a single statement
+CHUNK_SIZE = 50000
+
+
+def _column_exists(cr, table, column):
+    cr.execute(
+        """
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = %s AND column_name = %s
+        """,
+        (table, column),
+    )
+    return bool(cr.fetchone())
+
+
+def _get_id_ranges(cr, query):
+    """ Ranges of CHUNK_SIZE ids between the bounds returned by `query` """
+    cr.execute(query)
+    min_id, max_id = cr.fetchone()
+    if min_id is None:
+        return []
+    return [
+        (start, start + CHUNK_SIZE) for start in range(min_id, max_id + 1, CHUNK_SIZE)
+    ]
+
+
+def fill_delivery_zone(cr, open_only=False):
+    """ Write on sale orders and pickings the delivery zone of their
+    shipping partner, as the computed fields do, with one UPDATE per chunk
+    of ids instead of a recompute of every record.
+
+    :param open_only: only update the records not done or cancelled
+    """
+    if not _column_exists(cr, "res_partner", "delivery_zone_id"):
+        return
+    for start, end in _get_id_ranges(cr, "SELECT MIN(id), MAX(id) FROM sale_order"):
+        cr.execute(
+            """
+            UPDATE sale_order so
+            SET delivery_zone_id = zone.zone_id
+            FROM (
+                SELECT p.id,
+                    CASE WHEN p.type = 'delivery' THEN p.delivery_zone_id
+                    ELSE cp.delivery_zone_id END AS zone_id
+                FROM res_partner p
+                JOIN res_partner cp ON cp.id = COALESCE(p.commercial_partner_id, p.id)
+            ) zone
+            WHERE zone.id = so.partner_shipping_id
+                AND so.id >= %s AND so.id < %s
+                AND so.delivery_zone_id IS DISTINCT FROM zone.zone_id
+                AND (NOT %s OR so.state NOT IN ('done', 'cancel'))
+            """,
+            (start, end, open_only),
+        )
+        _logger.info(
+            "Delivery zone set on %s sale orders (ids %s to %s)",
+            cr.rowcount,
+            start,
+            end - 1,
+        )
+    for start, end in _get_id_ranges(cr, "SELECT MIN(id), MAX(id) FROM stock_picking"):
+        cr.execute(
+            """
+            UPDATE stock_picking sp
+            SET delivery_zone_id = zone.zone_id
+            FROM (
+                SELECT p.id,
+                    CASE WHEN p.type = 'delivery' THEN p.delivery_zone_id
+                    ELSE cp.delivery_zone_id END AS zone_id
+                FROM res_partner p
+                JOIN res_partner cp ON cp.id = COALESCE(p.commercial_partner_id, p.id)
+            ) zone
+            WHERE zone.id = sp.partner_id
+                AND sp.id >= %s AND sp.id < %s
+                AND sp.delivery_zone_id IS DISTINCT FROM zone.zone_id
+                AND (NOT %s OR sp.state NOT IN ('done', 'cancel'))
+            """,
+            (start, end, open_only),
+        )
+        _logger.info(
+            "Delivery zone set on %s pickings (ids %s to %s)",
+            cr.rowcount,
+            start,
+            end - 1,
+        )
+
+
+def pre_init_hook(cr):
+    """ Create the stored delivery zone columns before the install, so the
+    ORM doesn't compute them for every existing order and picking, and fill
+    them with SQL.
+    """
+    _logger.info("Creating the delivery zone columns of orders and pickings")
+    cr.execute(
+        "ALTER TABLE sale_order ADD COLUMN IF NOT EXISTS delivery_zone_id INTEGER"
+    )
+    cr.execute(
+        "ALTER TABLE stock_picking ADD COLUMN IF NOT EXISTS delivery_zone_id INTEGER"
+    )
+    fill_delivery_zone(cr)
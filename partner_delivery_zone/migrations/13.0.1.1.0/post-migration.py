@@ -0,0 +1,8 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+from odoo.addons.partner_delivery_zone.hooks import fill_delivery_zone
+
+
+def migrate(cr, version):
+    # realign the open orders and pickings whose partner zone changed before
+    # the zones were propagated to them
+    fill_delivery_zone(cr, open_only=True)
@@ -1,5 +1,7 @@
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+from . import ir_actions_report
 from . import partner_delivery_zone
+from . import partner_delivery_zone_zip
 from . import res_partner
 from . import sale_order
 from . import stock_move
@@ -0,0 +1,14 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+from odoo import models
+
+
+class IrActionsReport(models.Model):
+    _inherit = "ir.actions.report"
+
+    def _get_rendering_context(self, docids, data):
+        data = super()._get_rendering_context(docids, data)
+        if self.model == "stock.picking" and docids:
+            pickings = self.env["stock.picking"].browse(docids)
+            # read the zones of all the pickings at once, not in the report loop
+            pickings.mapped("delivery_zone_id").name_get()
+        return data
@@ -1,6 +1,28 @@
 # Copyright 2018 Tecnativa - Sergio Teruel
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
-from odoo import fields, models
+import json
+import math
+
+from odoo import _, api, fields, models, tools
+from odoo.exceptions import ValidationError
+
+# Maximum number of grid cells spanned by the zone areas, see _get_geo_index()
+MAX_GEO_CELLS = 100000
+
+
+def point_in_polygon(lon, lat, polygon):
+    """ Ray casting test of a point against a polygon given as a sequence
+    of (lon, lat) vertices
+    """
+    inside = False
+    lon_j, lat_j = polygon[-1]
+    for lon_i, lat_i in polygon:
+        if (lat_i > lat) != (lat_j > lat) and lon < (lon_j - lon_i) * (lat - lat_i) / (
+            lat_j - lat_i
+        ) + lon_i:
+            inside = not inside
+        lon_j, lat_j = lon_i, lat_i
+    return inside
 
 
 class PartnerDeliveryZone(models.Model):
@@ -9,3 +31,125 @@ class PartnerDeliveryZone(models.Model):
 
     code = fields.Char()
     name = fields.Char(string="Zone", required=True)
+    zip_ids = fields.One2many(
+        comodel_name="partner.delivery.zone.zip",
+        inverse_name="zone_id",
+        string="Postal Codes",
+    )
+    geo_polygon = fields.Text(
+        string="Area",
+        help="Optional area of the zone, as a JSON list of [longitude, "
+        "latitude] points, used to assign the zone to partners from their "
+        "coordinates.",
+    )
+
+    @api.constrains("geo_polygon")
+    def _check_geo_polygon(self):
+        for zone in self.filtered("geo_polygon"):
+            if not zone._parse_geo_polygon():
+                raise ValidationError(
+                    _(
+                        "The area of zone %s must be a JSON list of at least 3 "
+                        "[longitude, latitude] points."
+                    )
+                    % zone.name
+                )
+
+    def _parse_geo_polygon(self):
+        """ Vertices of the zone area as a tuple of (lon, lat), empty if the
+        area isn't valid
+        """
+        try:
+            points = json.loads(self.geo_polygon or "[]")
+            polygon = tuple((float(lon), float(lat)) for lon, lat in points)
+        except (ValueError, TypeError):
+            return ()
+        return polygon if len(polygon) >= 3 else ()
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        zones = super().create(vals_list)
+        if any(vals.get("geo_polygon") for vals in vals_list):
+            self.clear_caches()
+        return zones
+
+    def write(self, vals):
+        res = super().write(vals)
+        if "geo_polygon" in vals:
+            self.clear_caches()
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self.clear_caches()
+        return res
+
+    @api.model
+    @tools.ormcache()
+    def _get_geo_index(self):
+        """ Uniform grid over the areas of all the zones
+
+        The cell size is the median size of the area bounding boxes, so that
+        a few large areas don't make cells hold most of the small ones. It is
+        increased when the areas would span more than MAX_GEO_CELLS cells in
+        total, and the bounding boxes are checked before the polygons.
+
+        :return: (cell size, {(column, row): ((zone_id, box, polygon), ...)})
+        """
+        areas = []
+        for zone in self.sudo().search([("geo_polygon", "!=", False)]):
+            polygon = zone._parse_geo_polygon()
+            if polygon:
+                lons, lats = zip(*polygon)
+                box = (min(lons), min(lats), max(lons), max(lats))
+                areas.append((zone.id, box, polygon))
+        if not areas:
+            return 0.0, {}
+        sizes = sorted(max(box[2] - box[0], box[3] - box[1]) for _z, box, _p in areas)
+        cell_size = sizes[len(sizes) // 2] or 1.0
+
+        def cell_ranges(box):
+            return (
+                range(
+                    math.floor(box[0] / cell_size), math.floor(box[2] / cell_size) + 1
+                ),
+                range(
+                    math.floor(box[1] / cell_size), math.floor(box[3] / cell_size) + 1
+                ),
+            )
+
+        def count_cells():
+            return sum(
+                len(columns) * len(rows)
+                for columns, rows in (cell_ranges(area[1]) for area in areas)
+            )
+
+        # once the cells are larger than every box, each box spans 4 cells
+        # at most
+        while count_cells() > max(MAX_GEO_CELLS, 4 * len(areas)):
+            cell_size *= 2
+        grid = {}
+        for area in areas:
+            columns, rows = cell_ranges(area[1])
+            for column in columns:
+                for row in rows:
+                    grid.setdefault((column, row), []).append(area)
+        return cell_size, {cell: tuple(cell_areas) for cell, cell_areas in grid.items()}
+
+    @api.model
+    def _find_zone_id_by_position(self, lon, lat):
+        """ Delivery zone id of the first area containing a point, False if
+        there is none
+        """
+        cell_size, grid = self._get_geo_index()
+        if not grid:
+            return False
+        cell = (math.floor(lon / cell_size), math.floor(lat / cell_size))
+        for zone_id, box, polygon in grid.get(cell, ()):
+            if (
+                box[0] <= lon <= box[2]
+                and box[1] <= lat <= box[3]
+                and point_in_polygon(lon, lat, polygon)
+            ):
+                return zone_id
+        return False
@@ -0,0 +1,144 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+from bisect import bisect_right
+
+from odoo import _, api, fields, models, tools
+from odoo.exceptions import ValidationError
+
+
+def normalize_zip(zip_code):
+    """ Postal codes are compared without spaces and in upper case """
+    return "".join((zip_code or "").split()).upper()
+
+
+class PartnerDeliveryZoneZip(models.Model):
+    _name = "partner.delivery.zone.zip"
+    _description = "Partner delivery zone postal code range"
+    _order = "country_id, zip_from"
+
+    zone_id = fields.Many2one(
+        comodel_name="partner.delivery.zone",
+        string="Delivery Zone",
+        required=True,
+        ondelete="cascade",
+        index=True,
+    )
+    country_id = fields.Many2one(
+        comodel_name="res.country",
+        string="Country",
+        help="Leave empty to match the postal codes of any country.",
+    )
+    zip_from = fields.Char(
+        string="Zip From",
+        required=True,
+        help="First postal code or postal code prefix of the range.",
+    )
+    zip_to = fields.Char(
+        string="Zip To",
+        required=True,
+        help="Last postal code or postal code prefix of the range, with the "
+        "same length as 'Zip From'. A prefix covers all the postal codes "
+        "starting with it.",
+    )
+
+    @api.model
+    def _normalize_vals(self, vals):
+        for field_name in ("zip_from", "zip_to"):
+            if vals.get(field_name):
+                vals[field_name] = normalize_zip(vals[field_name])
+        return vals
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create([self._normalize_vals(vals) for vals in vals_list])
+        self.clear_caches()
+        return records
+
+    def write(self, vals):
+        res = super().write(self._normalize_vals(vals))
+        self.clear_caches()
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self.clear_caches()
+        return res
+
+    @api.constrains("country_id", "zip_from", "zip_to")
+    def _check_zip_range(self):
+        for zip_range in self:
+            if len(zip_range.zip_from) != len(zip_range.zip_to):
+                raise ValidationError(
+                    _("The postal codes of a range must have the same length.")
+                )
+            if zip_range.zip_from > zip_range.zip_to:
+                raise ValidationError(
+                    _("'Zip From' must be lower or equal than 'Zip To'.")
+                )
+            # compared in python, as the index is, not with the database
+            # collation
+            overlaps = self.search(
+                [
+                    ("id", "!=", zip_range.id),
+                    ("country_id", "=", zip_range.country_id.id),
+                ]
+            ).filtered(
+                lambda r: len(r.zip_from) == len(zip_range.zip_from)
+                and r.zip_from <= zip_range.zip_to
+                and r.zip_to >= zip_range.zip_from
+            )
+            if overlaps:
+                raise ValidationError(
+                    _("The postal code range %s - %s overlaps the range of zone %s.")
+                    % (zip_range.zip_from, zip_range.zip_to, overlaps[0].zone_id.name)
+                )
+
+    @api.model
+    @tools.ormcache()
+    def _get_zip_index(self):
+        """ Sorted intervals of all the postal code ranges
+
+        :return: {country_id: ((length, starts, ends, zone_ids), ...)} with
+            the longest (most specific) lengths first, False for the ranges
+            of any country
+        """
+        intervals = {}
+        ranges = self.sudo().search_read(
+            [], ["country_id", "zip_from", "zip_to", "zone_id"]
+        )
+        # sorted in python as the lookups bisect them, the database collation
+        # can order alphanumeric codes differently
+        ranges.sort(key=lambda zip_range: zip_range["zip_from"])
+        for zip_range in ranges:
+            country_id = zip_range["country_id"] and zip_range["country_id"][0]
+            key = (country_id, len(zip_range["zip_from"]))
+            interval = intervals.setdefault(key, ([], [], []))
+            interval[0].append(zip_range["zip_from"])
+            interval[1].append(zip_range["zip_to"])
+            interval[2].append(zip_range["zone_id"][0])
+        index = {}
+        for (country_id, length), interval in sorted(
+            intervals.items(), key=lambda item: -item[0][1]
+        ):
+            index.setdefault(country_id, []).append(
+                (length,) + tuple(tuple(values) for values in interval)
+            )
+        return {country_id: tuple(lengths) for country_id, lengths in index.items()}
+
+    @api.model
+    def _find_zone_id(self, country_id, zip_code):
+        """ Delivery zone id of a postal code, False if no range matches """
+        code = normalize_zip(zip_code)
+        if not code:
+            return False
+        index = self._get_zip_index()
+        for key in (country_id or False, False):
+            for length, starts, ends, zone_ids in index.get(key, ()):
+                if len(code) < length:
+                    continue
+                prefix = code[:length]
+                pos = bisect_right(starts, prefix) - 1
+                if pos >= 0 and prefix <= ends[pos]:
+                    return zone_ids[pos]
+            if not key:
+                break
+        return False
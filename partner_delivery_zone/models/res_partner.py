@@ -2,7 +2,14 @@
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
 from lxml import etree
 
-from odoo import api, fields, models
+from odoo import api, fields, models, tools
+from odoo.tools import split_every
+
+# number of orders or pickings updated by a single write
+PROPAGATION_CHUNK_SIZE = 1000
+# number of partners read at once when assigning zones in bulk
+ASSIGNMENT_CHUNK_SIZE = 5000
+GEOLOCATED_DOMAIN = ["|", ("partner_latitude", "!=", 0), ("partner_longitude", "!=", 0)]
 
 
 class ResPartner(models.Model):
@@ -15,6 +22,128 @@ class ResPartner(models.Model):
         index=True,
     )
 
+    def write(self, vals):
+        res = super().write(vals)
+        if "delivery_zone_id" in vals and not self.env.context.get(
+            "skip_delivery_zone_propagation"
+        ):
+            self._propagate_delivery_zone()
+        return res
+
+    def _get_delivery_zone_shipping_partners(self):
+        """ Shipping partners whose zone is resolved from these partners:
+        delivery addresses use their own zone, other contacts the zone of
+        their commercial partner.
+        """
+        return self.filtered(lambda p: p.type == "delivery") | self.with_context(
+            active_test=False
+        ).search(
+            [("commercial_partner_id", "in", self.ids), ("type", "!=", "delivery")]
+        )
+
+    def _propagate_delivery_zone(self):
+        """ Write the new zone on the open orders and pickings shipped to
+        these partners, with one write per zone and chunk instead of a
+        recompute of every record.
+        """
+        shipping_partners = self._get_delivery_zone_shipping_partners()
+        partners_by_zone = {}
+        for partner in shipping_partners:
+            zone = (
+                partner.delivery_zone_id
+                if partner.type == "delivery"
+                else partner.commercial_partner_id.delivery_zone_id
+            )
+            partners_by_zone.setdefault(zone, self.browse())
+            partners_by_zone[zone] |= partner
+        targets = [
+            ("sale.order", "partner_shipping_id"),
+            ("stock.picking", "partner_id"),
+        ]
+        for zone, partners in partners_by_zone.items():
+            for model, partner_field in targets:
+                records = (
+                    self.env[model]
+                    .sudo()
+                    .search(
+                        [
+                            (partner_field, "in", partners.ids),
+                            ("state", "not in", ("done", "cancel")),
+                            ("delivery_zone_id", "!=", zone.id),
+                        ]
+                    )
+                )
+                for ids in split_every(PROPAGATION_CHUNK_SIZE, records.ids):
+                    records.browse(ids).write({"delivery_zone_id": zone.id})
+
+    @api.model
+    def _assign_delivery_zones(self, domain, resolver):
+        """ Assign delivery zones to the partners of a domain in one
+        streaming pass: partners are read by chunks of increasing ids and
+        the cache is emptied after each chunk to keep the memory bounded.
+
+        :param resolver: name of a partners method returning the zone id
+            resolved for each of them, as {partner_id: zone_id}
+        :return: number of partners whose zone changed
+        """
+        assigned = 0
+        last_id = 0
+        while True:
+            partners = self.search(
+                domain + [("id", ">", last_id)], order="id", limit=ASSIGNMENT_CHUNK_SIZE
+            )
+            if not partners:
+                break
+            last_id = partners[-1].id
+            partner_ids_by_zone = {}
+            for partner_id, zone_id in getattr(partners, resolver)().items():
+                partner = partners.browse(partner_id)
+                if zone_id and zone_id != partner.delivery_zone_id.id:
+                    partner_ids_by_zone.setdefault(zone_id, []).append(partner_id)
+            for zone_id, partner_ids in partner_ids_by_zone.items():
+                partners.browse(partner_ids).write({"delivery_zone_id": zone_id})
+                assigned += len(partner_ids)
+            self.invalidate_cache()
+        return assigned
+
+    def _get_zip_delivery_zones(self):
+        find_zone_id = self.env["partner.delivery.zone.zip"]._find_zone_id
+        return {
+            partner.id: find_zone_id(partner.country_id.id, partner.zip)
+            for partner in self
+        }
+
+    def action_assign_delivery_zone_from_zip(self):
+        return self._assign_delivery_zones(
+            [("id", "in", self.ids), ("zip", "!=", False)], "_get_zip_delivery_zones"
+        )
+
+    @api.model
+    def assign_all_delivery_zones_from_zip(self):
+        return self._assign_delivery_zones(
+            [("zip", "!=", False)], "_get_zip_delivery_zones"
+        )
+
+    def _get_geo_delivery_zones(self):
+        find_zone_id = self.env["partner.delivery.zone"]._find_zone_id_by_position
+        return {
+            partner.id: find_zone_id(
+                partner.partner_longitude, partner.partner_latitude
+            )
+            for partner in self
+        }
+
+    def action_assign_delivery_zone_from_geo(self):
+        return self._assign_delivery_zones(
+            [("id", "in", self.ids)] + GEOLOCATED_DOMAIN, "_get_geo_delivery_zones"
+        )
+
+    @api.model
+    def assign_all_delivery_zones_from_geo(self):
+        return self._assign_delivery_zones(
+            list(GEOLOCATED_DOMAIN), "_get_geo_delivery_zones"
+        )
+
     @api.model
     def fields_view_get(
         self, view_id=None, view_type="form", toolbar=False, submenu=False
@@ -29,13 +158,25 @@ class ResPartner(models.Model):
             view_id=view_id, view_type=view_type, toolbar=toolbar, submenu=submenu
         )
         if view_type == "form":
-            partner_xml = etree.XML(res["arch"])
-            partner_fields = partner_xml.xpath("//field[@name='child_ids']")
-            if partner_fields:
-                partner_field = partner_fields[0]
-                context = partner_field.attrib.get("context", "{}").replace(
-                    "{", "{'default_delivery_zone_id': delivery_zone_id, ", 1
-                )
-                partner_field.attrib["context"] = context
-                res["arch"] = etree.tostring(partner_xml)
+            res["arch"] = self._add_delivery_zone_child_context(res["arch"])
         return res
+
+    @api.model
+    @tools.ormcache("arch")
+    def _add_delivery_zone_child_context(self, arch):
+        """ Patch the context of "child_ids" in a form arch
+
+        Cached on the arch itself, which already depends on the view, the
+        language and the installed modules. The registry caches are cleared
+        when views are modified, so repeated loads don't parse the XML.
+        """
+        partner_xml = etree.XML(arch)
+        partner_fields = partner_xml.xpath("//field[@name='child_ids']")
+        if not partner_fields:
+            return arch
+        partner_field = partner_fields[0]
+        context = partner_field.attrib.get("context", "{}").replace(
+            "{", "{'default_delivery_zone_id': delivery_zone_id, ", 1
+        )
+        partner_field.attrib["context"] = context
+        return etree.tostring(partner_xml)
@@ -6,6 +6,12 @@ from odoo import models
 class StockMove(models.Model):
     _inherit = "stock.move"
 
+    def _assign_picking(self):
+        # read the zones of all the moves at once, the moves of each new
+        # picking then find them in cache
+        self.mapped("sale_line_id.order_id.delivery_zone_id")
+        return super()._assign_picking()
+
     def _get_new_picking_values(self):
         vals = super()._get_new_picking_values()
         vals["delivery_zone_id"] = self.sale_line_id.order_id.delivery_zone_id.id
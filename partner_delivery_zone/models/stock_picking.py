@@ -1,7 +1,57 @@
 # Copyright 2018 Tecnativa - Sergio Teruel
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+import math
+
 from odoo import api, fields, models
 
+EARTH_RADIUS_KM = 6371.0
+
+
+def haversine(point_a, point_b):
+    """ Great circle distance in km between two (lat, lon) points """
+    lat_a, lon_a = map(math.radians, point_a)
+    lat_b, lon_b = map(math.radians, point_b)
+    value = (
+        math.sin((lat_b - lat_a) / 2) ** 2
+        + math.cos(lat_a) * math.cos(lat_b) * math.sin((lon_b - lon_a) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(value))
+
+
+def shortest_route(points, start=None):
+    """ Order points in a short open route, built by nearest neighbour and
+    improved by 2-opt over a precomputed distance matrix
+
+    :param points: list of (lat, lon)
+    :param start: optional (lat, lon) the route starts from, the first
+        point otherwise
+    :return: list of the indexes of `points` in route order
+    """
+    nodes = ([start] if start else []) + list(points)
+    offset = 1 if start else 0
+    distance = [[haversine(a, b) for b in nodes] for a in nodes]
+    route = [0]
+    pending = set(range(1, len(nodes)))
+    while pending:
+        last = distance[route[-1]]
+        nearest = min(pending, key=lambda node: last[node])
+        route.append(nearest)
+        pending.remove(nearest)
+    improved = True
+    while improved:
+        improved = False
+        for i in range(1, len(route) - 1):
+            for k in range(i + 1, len(route)):
+                before = distance[route[i - 1]][route[i]]
+                after = distance[route[i - 1]][route[k]]
+                if k + 1 < len(route):
+                    before += distance[route[k]][route[k + 1]]
+                    after += distance[route[i]][route[k + 1]]
+                if after < before - 1e-9:
+                    route[i : k + 1] = reversed(route[i : k + 1])
+                    improved = True
+    return [node - offset for node in route[offset:]]
+
 
 class StockPicking(models.Model):
     _inherit = "stock.picking"
@@ -14,6 +64,11 @@ class StockPicking(models.Model):
         readonly=False,
         compute="_compute_delivery_zone_id",
     )
+    delivery_stop_sequence = fields.Integer(
+        string="Delivery Stop",
+        copy=False,
+        help="Order of the picking in the delivery route of its zone.",
+    )
 
     @api.depends("partner_id")
     def _compute_delivery_zone_id(self):
@@ -24,3 +79,65 @@ class StockPicking(models.Model):
                 else picking.partner_id.commercial_partner_id
             )
             picking.delivery_zone_id = partner.delivery_zone_id
+
+    def _get_delivery_stop_position(self):
+        """ (lat, lon) of the delivery address, False if not geolocated """
+        self.ensure_one()
+        for partner in self.partner_id | self.partner_id.commercial_partner_id:
+            if partner.partner_latitude or partner.partner_longitude:
+                return partner.partner_latitude, partner.partner_longitude
+        return False
+
+    def _get_delivery_stop_window(self):
+        """ Hook returning the delivery window of the picking, the stops of
+        the earliest windows are visited first. partner_delivery_zone_schedule
+        returns the start hour of the customer schedules.
+        """
+        return 0.0
+
+    def _get_delivery_route_start(self):
+        """ (lat, lon) the routes start from: the warehouse address """
+        partner = self[:1].picking_type_id.warehouse_id.partner_id
+        if partner.partner_latitude or partner.partner_longitude:
+            return partner.partner_latitude, partner.partner_longitude
+        return None
+
+    def _sequence_delivery_stops(self):
+        """ Number the pickings of each zone in route order: by schedule
+        window, then by distance within each window, from the warehouse or
+        the previous window. Pickings without coordinates go last.
+        """
+        for __, pickings in self._group_by_delivery_zone().items():
+            pickings = pickings.sorted(lambda p: (p.scheduled_date, p.id))
+            windows = {}
+            unlocated = self.browse()
+            for picking in pickings:
+                position = picking._get_delivery_stop_position()
+                if not position:
+                    unlocated |= picking
+                    continue
+                window = windows.setdefault(
+                    picking._get_delivery_stop_window(), ([], [])
+                )
+                window[0].append(picking)
+                window[1].append(position)
+            start = pickings._get_delivery_route_start()
+            route = []
+            for __, (window_pickings, positions) in sorted(windows.items()):
+                order = shortest_route(positions, start)
+                route += [window_pickings[index] for index in order]
+                start = positions[order[-1]]
+            route += list(unlocated)
+            for sequence, picking in enumerate(route, 1):
+                picking.delivery_stop_sequence = sequence
+
+    def _group_by_delivery_zone(self):
+        pickings_by_zone = {}
+        for picking in self:
+            zone = picking.delivery_zone_id
+            pickings_by_zone.setdefault(zone, self.browse())
+            pickings_by_zone[zone] |= picking
+        return pickings_by_zone
+
+    def action_sequence_delivery_stops(self):
+        self._sequence_delivery_stops()
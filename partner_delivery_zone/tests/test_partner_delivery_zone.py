@@ -1,7 +1,10 @@
 # Copyright 2018 Tecnativa - Sergio Teruel
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+from unittest import mock
+
 from lxml import etree
 
+from odoo.exceptions import ValidationError
 from odoo.tests import SavepointCase
 
 
@@ -96,6 +99,158 @@ class TestPartnerDeliveryZone(SavepointCase):
         ctx = self._get_ctx_from_view(res)
         self.assertTrue("default_delivery_zone_id" in ctx)
 
+    def test_fields_view_get_cache(self):
+        view_id = self.env.ref("partner_delivery_zone.view_partner_form").id
+        self.partner.fields_view_get(view_id=view_id, view_type="form")
+        with mock.patch(
+            "odoo.addons.partner_delivery_zone.models.res_partner.etree.XML",
+            wraps=etree.XML,
+        ) as xml:
+            res = self.partner.fields_view_get(view_id=view_id, view_type="form")
+        self.assertFalse(xml.called)
+        self.assertTrue("default_delivery_zone_id" in self._get_ctx_from_view(res))
+
+    def test_propagate_partner_delivery_zone(self):
+        contact = self.env["res.partner"].create(
+            {"name": "Partner contact", "type": "contact", "parent_id": self.partner.id}
+        )
+        self.order.action_confirm()
+        picking = self.order.picking_ids
+        picking.partner_id = contact
+        # archived contacts still ship the open pickings
+        contact.active = False
+        self.partner.delivery_zone_id = self.delivery_zone_b
+        self.assertEqual(self.order.delivery_zone_id, self.delivery_zone_b)
+        self.assertEqual(picking.delivery_zone_id, self.delivery_zone_b)
+        picking.action_cancel()
+        self.partner.with_context(
+            skip_delivery_zone_propagation=True
+        ).delivery_zone_id = self.delivery_zone_a
+        self.assertEqual(self.order.delivery_zone_id, self.delivery_zone_b)
+        self.partner.delivery_zone_id = False
+        self.assertFalse(self.order.delivery_zone_id)
+        self.assertEqual(picking.delivery_zone_id, self.delivery_zone_b)
+
+    def test_assign_delivery_zone_from_zip(self):
+        spain = self.env.ref("base.es")
+        zip_ranges = self.env["partner.delivery.zone.zip"]
+        zip_ranges.create(
+            [
+                {
+                    "zone_id": self.delivery_zone_b.id,
+                    "country_id": spain.id,
+                    "zip_from": "28000",
+                    "zip_to": "28999",
+                },
+                {"zone_id": self.delivery_zone_a.id, "zip_from": "08", "zip_to": "08"},
+            ]
+        )
+        with self.assertRaises(ValidationError):
+            zip_ranges.create(
+                {
+                    "zone_id": self.delivery_zone_a.id,
+                    "country_id": spain.id,
+                    "zip_from": "28500",
+                    "zip_to": "29500",
+                }
+            )
+        self.partner.write({"country_id": spain.id, "zip": " 28 010"})
+        other_partner = self.env["res.partner"].create(
+            {"name": "other partner", "country_id": spain.id, "zip": "08001"}
+        )
+        unknown_partner = self.env["res.partner"].create(
+            {"name": "unknown partner", "zip": "29001"}
+        )
+        partners = self.partner | other_partner | unknown_partner
+        self.assertEqual(partners.action_assign_delivery_zone_from_zip(), 2)
+        self.assertEqual(self.partner.delivery_zone_id, self.delivery_zone_b)
+        self.assertEqual(self.order.delivery_zone_id, self.delivery_zone_b)
+        self.assertEqual(other_partner.delivery_zone_id, self.delivery_zone_a)
+        self.assertFalse(unknown_partner.delivery_zone_id)
+        # codes with letters and hyphens are compared by code point
+        netherlands = self.env.ref("base.nl")
+        zip_ranges.create(
+            [
+                {
+                    "zone_id": self.delivery_zone_a.id,
+                    "country_id": netherlands.id,
+                    "zip_from": "1011AA",
+                    "zip_to": "1011ZZ",
+                },
+                {
+                    "zone_id": self.delivery_zone_b.id,
+                    "country_id": netherlands.id,
+                    "zip_from": "1011-0",
+                    "zip_to": "1011-9",
+                },
+            ]
+        )
+        self.assertEqual(
+            zip_ranges._find_zone_id(netherlands.id, "1011CD"), self.delivery_zone_a.id
+        )
+        self.assertEqual(
+            zip_ranges._find_zone_id(netherlands.id, "1011-5"), self.delivery_zone_b.id
+        )
+
+    def test_assign_delivery_zone_from_geo(self):
+        self.delivery_zone_a.geo_polygon = "[[0, 0], [2, 0], [2, 2], [0, 2]]"
+        self.delivery_zone_b.geo_polygon = "[[2, 0], [4, 0], [3, 2]]"
+        with self.assertRaises(ValidationError):
+            self.delivery_zone_b.geo_polygon = "[[2, 0], [4, 0]]"
+        self.partner.write({"partner_longitude": 3.0, "partner_latitude": 0.5})
+        other_partner = self.env["res.partner"].create(
+            {"name": "other partner", "partner_longitude": 1, "partner_latitude": 1}
+        )
+        outside_partner = self.env["res.partner"].create(
+            {
+                "name": "outside partner",
+                "partner_longitude": 3.8,
+                "partner_latitude": 1.5,
+            }
+        )
+        partners = self.partner | other_partner | outside_partner
+        self.assertEqual(partners.action_assign_delivery_zone_from_geo(), 2)
+        self.assertEqual(self.partner.delivery_zone_id, self.delivery_zone_b)
+        self.assertEqual(other_partner.delivery_zone_id, self.delivery_zone_a)
+        self.assertFalse(outside_partner.delivery_zone_id)
+        # the cell size follows the median area, not a single large one
+        zones = self.env["partner.delivery.zone"]
+        zones.create({"name": "Large", "geo_polygon": "[[-90, 0], [90, 0], [0, 80]]"})
+        self.assertEqual(zones._get_geo_index()[0], 2.0)
+        self.assertEqual(
+            zones._find_zone_id_by_position(3.0, 0.5), self.delivery_zone_b.id
+        )
+
+    def test_sequence_delivery_stops(self):
+        picking_type = self.env.ref("stock.picking_type_out")
+        picking_type.warehouse_id.partner_id.write(
+            {"partner_latitude": 0.0, "partner_longitude": 1.0}
+        )
+        pickings = self.env["stock.picking"]
+        # the nearest stop first route (2, 4, 1, 3) is 776 km long, the
+        # shortest one 648 km
+        for latitude, longitude in ((0.0, 3.0), (0.5, 2.0), (3.0, 1.5), (1.0, 1.5)):
+            partner = self.env["res.partner"].create(
+                {
+                    "name": "Stop",
+                    "delivery_zone_id": self.delivery_zone_a.id,
+                    "partner_latitude": latitude,
+                    "partner_longitude": longitude,
+                }
+            )
+            pickings |= self.env["stock.picking"].create(
+                {
+                    "partner_id": partner.id,
+                    "picking_type_id": picking_type.id,
+                    "location_id": picking_type.default_location_src_id.id,
+                    "location_dest_id": self.env.ref(
+                        "stock.stock_location_customers"
+                    ).id,
+                }
+            )
+        pickings.action_sequence_delivery_stops()
+        self.assertEqual(pickings.mapped("delivery_stop_sequence"), [1, 2, 4, 3])
+
     def test_order_assign_commercial_partner_delivery_zone(self):
         # For contact type partners the delivery zone get from commercial
         # partner
@@ -0,0 +1,25 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+from odoo import models
+
+from odoo.addons.partner_delivery_schedule.models.partner_delivery_schedule import (
+    WEEKDAYS,
+)
+
+
+class StockPicking(models.Model):
+    _inherit = "stock.picking"
+
+    def _get_delivery_stop_window(self):
+        """ Start hour of the customer schedules on the picking day, to visit
+        the earliest windows first
+        """
+        self.ensure_one()
+        if not self.scheduled_date:
+            return super()._get_delivery_stop_window()
+        weekday = WEEKDAYS[self._get_local_scheduled_date().weekday()]
+        schedules = (
+            self._get_delivery_schedule_partner()
+            .sudo()
+            .delivery_schedule_ids.filtered(weekday)
+        )
+        return min(schedules.mapped("hour_from"), default=0.0)
@@ -0,0 +1,51 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+from odoo.tests import SavepointCase
+
+
+class TestPartnerDeliveryZoneSchedule(SavepointCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.zone = cls.env["partner.delivery.zone"].create({"name": "Zone"})
+        cls.picking_type = cls.env.ref("stock.picking_type_out")
+        cls.picking_type.warehouse_id.partner_id.write(
+            {"partner_latitude": 0.0, "partner_longitude": 1.0}
+        )
+
+    def _create_picking(self, latitude, hour_from):
+        schedule = self.env["delivery.schedule"].create(
+            {
+                "name": "From %s" % hour_from,
+                "hour_from": hour_from,
+                "hour_to": 20,
+                "saturday": True,
+                "sunday": True,
+            }
+        )
+        partner = self.env["res.partner"].create(
+            {
+                "name": "Stop",
+                "tz": "UTC",
+                "delivery_zone_id": self.zone.id,
+                "partner_latitude": latitude,
+                "partner_longitude": 1.0,
+                "delivery_schedule_ids": [(6, 0, schedule.ids)],
+            }
+        )
+        return self.env["stock.picking"].create(
+            {
+                "partner_id": partner.id,
+                "picking_type_id": self.picking_type.id,
+                "location_id": self.picking_type.default_location_src_id.id,
+                "location_dest_id": self.env.ref("stock.stock_location_customers").id,
+                "scheduled_date": "2018-09-03 12:00:00",
+            }
+        )
+
+    def test_sequence_delivery_stops_by_schedule(self):
+        near = self._create_picking(1.0, 10.0)
+        far = self._create_picking(3.0, 8.0)
+        self.assertEqual(near._get_delivery_stop_window(), 10.0)
+        (near | far).action_sequence_delivery_stops()
+        self.assertEqual(far.delivery_stop_sequence, 1)
+        self.assertEqual(near.delivery_stop_sequence, 2)
@@ -13,6 +13,9 @@ setuptools.setup(
         'odoo13-addon-delivery_free_fee_removal',
         'odoo13-addon-partner_delivery_schedule',
         'odoo13-addon-partner_delivery_zone',
+        'odoo13-addon-partner_delivery_zone_schedule',
+        'odoo13-addon-stock_picking_batch_delivery_zone',
+        'odoo13-addon-stock_picking_delivery_zone_workload',
         'odoo13-addon-stock_picking_report_delivery_cost',
     ],
     classifiers=[
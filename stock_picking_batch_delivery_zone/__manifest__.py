@@ -0,0 +1,19 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+{
+    "name": "Stock Picking Batch Delivery Zone",
+    "summary": "Group the ready deliveries in batches by delivery zone",
+    "version": "13.0.1.0.0",
+    "development_status": "Beta",
+    "category": "Delivery",
+    "website": "https://github.com/OCA/delivery-carrier",
+    "author": "Odoo Community Association (OCA)",
+    "license": "AGPL-3",
+    "application": False,
+    "installable": True,
+    "depends": ["delivery", "partner_delivery_zone", "stock_picking_batch"],
+    "data": [
+        "data/ir_cron.xml",
+        "views/partner_delivery_zone_view.xml",
+        "views/stock_picking_batch_view.xml",
+    ],
+}
@@ -0,0 +1,4 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+from . import partner_delivery_zone
+from . import stock_picking
+from . import stock_picking_batch
@@ -0,0 +1,17 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+from odoo import fields, models
+
+
+class PartnerDeliveryZone(models.Model):
+    _inherit = "partner.delivery.zone"
+
+    batch_max_weight = fields.Float(
+        string="Batch Max Weight",
+        help="Maximum weight of the pickings grouped in a batch of this zone. "
+        "Leave 0 for no limit.",
+    )
+    batch_max_pickings = fields.Integer(
+        string="Batch Max Pickings",
+        help="Maximum number of pickings grouped in a batch of this zone. "
+        "Leave 0 for no limit.",
+    )
@@ -0,0 +1,16 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+from odoo import models
+
+
+class StockPicking(models.Model):
+    _inherit = "stock.picking"
+
+    def action_create_delivery_zone_batches(self):
+        batches = self.env["stock.picking.batch"].create_delivery_zone_batches(
+            [("id", "in", self.ids)]
+        )
+        action = self.env.ref("stock_picking_batch.stock_picking_batch_action").read()[
+            0
+        ]
+        action["domain"] = [("id", "in", batches.ids)]
+        return action
@@ -0,0 +1,136 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+from odoo import api, fields, models
+
+import pytz
+
+# fields of the candidate pickings read at once to build the batches
+BATCH_PICKING_FIELDS = [
+    "company_id",
+    "delivery_zone_id",
+    "carrier_id",
+    "scheduled_date",
+    "weight",
+]
+
+
+class StockPickingBatch(models.Model):
+    _inherit = "stock.picking.batch"
+
+    delivery_zone_id = fields.Many2one(
+        comodel_name="partner.delivery.zone",
+        string="Delivery Zone",
+        index=True,
+        readonly=True,
+    )
+    carrier_id = fields.Many2one(
+        comodel_name="delivery.carrier", string="Carrier", readonly=True,
+    )
+
+    @api.model
+    def _get_delivery_zone_batch_domain(self):
+        """ Pickings that can be grouped in delivery zone batches """
+        return [
+            ("picking_type_code", "=", "outgoing"),
+            ("state", "=", "assigned"),
+            ("batch_id", "=", False),
+            ("delivery_zone_id", "!=", False),
+        ]
+
+    @api.model
+    def _split_delivery_zone_batches(self, pickings_data):
+        """ Group pickings by company, zone, carrier and scheduled day, in
+        the time zone of the company, and split the groups at the limits of
+        their zone
+
+        :param pickings_data: raw values of `BATCH_PICKING_FIELDS` of the
+            pickings, in scheduled order
+        :return: list of (group key, picking ids) of the batches to create
+        """
+        companies = self.env["res.company"].browse(
+            {data["company_id"] for data in pickings_data}
+        )
+        tz_by_company = {
+            company.id: pytz.timezone(company.partner_id.tz or "UTC")
+            for company in companies
+        }
+        groups = {}
+        for data in pickings_data:
+            local_date = pytz.utc.localize(data["scheduled_date"]).astimezone(
+                tz_by_company[data["company_id"]]
+            )
+            key = (
+                data["company_id"],
+                data["delivery_zone_id"],
+                data["carrier_id"],
+                local_date.date(),
+            )
+            groups.setdefault(key, []).append(data)
+        zones = self.env["partner.delivery.zone"].browse({key[1] for key in groups})
+        limits = {
+            zone["id"]: (zone["batch_max_weight"], zone["batch_max_pickings"])
+            for zone in zones.read(["batch_max_weight", "batch_max_pickings"])
+        }
+        batches = []
+        for key, group in groups.items():
+            max_weight, max_pickings = limits[key[1]]
+            picking_ids, weight = [], 0.0
+            for data in group:
+                if picking_ids and (
+                    (max_pickings and len(picking_ids) >= max_pickings)
+                    or (max_weight and weight + data["weight"] > max_weight)
+                ):
+                    batches.append((key, picking_ids))
+                    picking_ids, weight = [], 0.0
+                picking_ids.append(data["id"])
+                weight += data["weight"]
+            batches.append((key, picking_ids))
+        return batches
+
+    @api.model
+    def create_delivery_zone_batches(self, domain=None):
+        """ Group the ready outgoing pickings in batches by delivery zone,
+        carrier and scheduled day, within the limits set on the zones
+
+        :param domain: optional domain restricting the candidate pickings
+        :return: created stock.picking.batch
+        """
+        pickings = self.env["stock.picking"].search(
+            self._get_delivery_zone_batch_domain() + (domain or []),
+            order="scheduled_date, id",
+        )
+        if not pickings:
+            return self.browse()
+        # lock the candidates, the ones being batched by a concurrent run are
+        # skipped
+        self.env["stock.picking"].flush(["batch_id"])
+        self.env.cr.execute(
+            """
+            SELECT id FROM stock_picking
+            WHERE id IN %s AND batch_id IS NULL
+            FOR UPDATE SKIP LOCKED
+            """,
+            (tuple(pickings.ids),),
+        )
+        locked_ids = {row[0] for row in self.env.cr.fetchall()}
+        pickings = pickings.filtered(lambda p: p.id in locked_ids)
+        pickings.invalidate_cache()
+        if not pickings:
+            return self.browse()
+        batches = self._split_delivery_zone_batches(
+            pickings.read(BATCH_PICKING_FIELDS, load=None)
+        )
+        return self.create(
+            [
+                {
+                    "company_id": company_id,
+                    "delivery_zone_id": zone_id,
+                    "carrier_id": carrier_id,
+                    "picking_ids": [(6, 0, picking_ids)],
+                }
+                for (company_id, zone_id, carrier_id, __), picking_ids in batches
+            ]
+        )
+
+    @api.model
+    def _cron_create_delivery_zone_batches(self):
+        self.create_delivery_zone_batches()
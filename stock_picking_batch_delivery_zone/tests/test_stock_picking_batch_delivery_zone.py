@@ -0,0 +1,95 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+from odoo.tests import SavepointCase
+
+
+class TestStockPickingBatchDeliveryZone(SavepointCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.zone = cls.env["partner.delivery.zone"].create(
+            {"name": "Zone", "batch_max_pickings": 2, "batch_max_weight": 25.0}
+        )
+        cls.other_zone = cls.env["partner.delivery.zone"].create({"name": "Other"})
+        cls.carrier = cls.env.ref("delivery.free_delivery_carrier")
+        cls.product = cls.env["product.product"].create(
+            {"name": "Test product", "type": "consu", "weight": 1.0}
+        )
+        cls.picking_type = cls.env.ref("stock.picking_type_out")
+
+    def _create_picking(self, zone, weight=1.0):
+        partner = self.env["res.partner"].create(
+            {"name": "Customer", "delivery_zone_id": zone.id}
+        )
+        picking = self.env["stock.picking"].create(
+            {
+                "partner_id": partner.id,
+                "picking_type_id": self.picking_type.id,
+                "location_id": self.picking_type.default_location_src_id.id,
+                "location_dest_id": self.env.ref("stock.stock_location_customers").id,
+                "carrier_id": self.carrier.id,
+                "move_lines": [
+                    (
+                        0,
+                        0,
+                        {
+                            "name": self.product.name,
+                            "product_id": self.product.id,
+                            "product_uom": self.product.uom_id.id,
+                            "product_uom_qty": weight,
+                            "location_id": self.picking_type.default_location_src_id.id,
+                            "location_dest_id": self.env.ref(
+                                "stock.stock_location_customers"
+                            ).id,
+                        },
+                    )
+                ],
+            }
+        )
+        picking.action_confirm()
+        picking.action_assign()
+        return picking
+
+    def test_create_delivery_zone_batches(self):
+        pickings = self._create_picking(self.zone)
+        for __ in range(2):
+            pickings |= self._create_picking(self.zone)
+        heavy = self._create_picking(self.zone, weight=30.0)
+        other = self._create_picking(self.other_zone)
+        draft = self._create_picking(self.zone)
+        draft.do_unreserve()
+        draft.action_cancel()
+        batches = (
+            pickings | heavy | other | draft
+        ).action_create_delivery_zone_batches()
+        batches = self.env["stock.picking.batch"].search(batches["domain"])
+        self.assertEqual(len(batches), 4)
+        self.assertEqual(
+            sorted(len(batch.picking_ids) for batch in batches), [1, 1, 1, 2]
+        )
+        self.assertEqual(heavy.batch_id.picking_ids, heavy)
+        self.assertEqual(other.batch_id.delivery_zone_id, self.other_zone)
+        self.assertEqual(other.batch_id.carrier_id, self.carrier)
+        self.assertFalse(draft.batch_id)
+        self.assertFalse(
+            self.env["stock.picking.batch"].create_delivery_zone_batches(
+                [("id", "in", pickings.ids)]
+            )
+        )
+
+    def test_delivery_zone_batches_local_day(self):
+        self.env.user.company_id.partner_id.tz = "Europe/Madrid"
+        pickings = self.env["stock.picking"]
+        # 23:30 on the 4th, then 00:30 and 02:30 on the 5th in Madrid
+        for date in (
+            "2018-09-04 21:30:00",
+            "2018-09-04 22:30:00",
+            "2018-09-05 00:30:00",
+        ):
+            picking = self._create_picking(self.other_zone)
+            picking.scheduled_date = date
+            pickings |= picking
+        self.env["stock.picking.batch"].create_delivery_zone_batches(
+            [("id", "in", pickings.ids)]
+        )
+        self.assertEqual(pickings[1].batch_id, pickings[2].batch_id)
+        self.assertNotEqual(pickings[0].batch_id, pickings[1].batch_id)
@@ -0,0 +1,5 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+from . import delivery_zone_workload
+from . import sale_order_line
+from . import stock_move
+from . import stock_picking
@@ -0,0 +1,149 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+from odoo import api, fields, models
+from odoo.tools import sql
+
+
+class DeliveryZoneWorkload(models.Model):
+    """ Open outgoing pickings aggregated by delivery zone, day and carrier
+
+    The rows are materialized in a table refreshed for the zones and days
+    of the pickings that change, so dashboards read them directly instead
+    of grouping all the pickings on each refresh. A unique index on the
+    row keys makes concurrent refreshes of the same rows update them instead
+    of inserting duplicates.
+    """
+
+    _name = "delivery.zone.workload"
+    _description = "Delivery zone workload"
+    _order = "date, zone_id, carrier_id"
+
+    zone_id = fields.Many2one(
+        comodel_name="partner.delivery.zone",
+        string="Delivery Zone",
+        readonly=True,
+        index=True,
+    )
+    date = fields.Date(readonly=True, index=True)
+    carrier_id = fields.Many2one(
+        comodel_name="delivery.carrier", string="Carrier", readonly=True
+    )
+    company_id = fields.Many2one(
+        comodel_name="res.company", string="Company", readonly=True
+    )
+    picking_count = fields.Integer(string="Pickings", readonly=True)
+    weight = fields.Float(readonly=True, digits="Stock Weight")
+    carrier_price = fields.Float(
+        string="Shipping Cost",
+        readonly=True,
+        help="Price of the delivery lines of the sale orders of the pickings, "
+        "or carrier price of the pickings without delivery line.",
+    )
+
+    def init(self):
+        if not sql.index_exists(self.env.cr, "delivery_zone_workload_key_uniq"):
+            # rows duplicated by concurrent refreshes are rebuilt below
+            self.env.cr.execute("DELETE FROM delivery_zone_workload")
+            sql.create_unique_index(
+                self.env.cr,
+                "delivery_zone_workload_key_uniq",
+                self._table,
+                [
+                    "zone_id",
+                    "date",
+                    "COALESCE(carrier_id, 0)",
+                    "COALESCE(company_id, 0)",
+                ],
+            )
+        self._refresh_workload()
+
+    @api.model
+    def _refresh_workload(self, zone_ids=None, dates=None):
+        """ Recompute the rows of the given zones and days, all of them if
+        no zone is given
+
+        The rows are upserted and then the rows left without pickings are
+        deleted, so a concurrent refresh of the same rows waits for this one
+        instead of inserting them twice.
+        """
+        self.flush()
+        self.env["stock.picking"].flush(
+            [
+                "delivery_zone_id",
+                "scheduled_date",
+                "carrier_id",
+                "company_id",
+                "weight",
+                "carrier_price",
+                "state",
+                "picking_type_id",
+                "sale_id",
+            ]
+        )
+        self.env["sale.order.line"].flush(["order_id", "is_delivery", "price_unit"])
+        params = {
+            "all": zone_ids is None,
+            "zone_ids": list(zone_ids or []),
+            "dates": list(dates or []),
+            "uid": self.env.uid,
+        }
+        self.env.cr.execute(
+            """
+            WITH refreshed AS (
+                INSERT INTO delivery_zone_workload (
+                    zone_id, date, carrier_id, company_id, picking_count,
+                    weight, carrier_price,
+                    create_uid, create_date, write_uid, write_date
+                )
+                SELECT
+                    p.delivery_zone_id, p.scheduled_date::date, p.carrier_id,
+                    p.company_id, COUNT(*), SUM(COALESCE(p.weight, 0.0)),
+                    SUM(COALESCE(delivery.price_unit, p.carrier_price, 0.0)),
+                    %(uid)s, NOW() AT TIME ZONE 'UTC',
+                    %(uid)s, NOW() AT TIME ZONE 'UTC'
+                FROM stock_picking p
+                JOIN stock_picking_type t ON t.id = p.picking_type_id
+                -- the shipping cost is known on the delivery lines of the sale
+                -- order, the carrier price is only set on validation
+                LEFT JOIN LATERAL (
+                    SELECT SUM(sol.price_unit) AS price_unit
+                    FROM sale_order_line sol
+                    WHERE sol.order_id = p.sale_id AND sol.is_delivery
+                ) delivery ON TRUE
+                WHERE t.code = 'outgoing'
+                    AND p.state NOT IN ('draft', 'done', 'cancel')
+                    AND p.delivery_zone_id IS NOT NULL
+                    AND (
+                        %(all)s
+                        OR (
+                            p.delivery_zone_id = ANY(%(zone_ids)s)
+                            AND p.scheduled_date::date = ANY(%(dates)s::date[])
+                        )
+                    )
+                GROUP BY
+                    p.delivery_zone_id, p.scheduled_date::date, p.carrier_id,
+                    p.company_id
+                ON CONFLICT (
+                    zone_id, date, COALESCE(carrier_id, 0), COALESCE(company_id, 0)
+                )
+                DO UPDATE SET
+                    picking_count = EXCLUDED.picking_count,
+                    weight = EXCLUDED.weight,
+                    carrier_price = EXCLUDED.carrier_price,
+                    write_uid = EXCLUDED.write_uid,
+                    write_date = EXCLUDED.write_date
+                RETURNING id
+            )
+            DELETE FROM delivery_zone_workload
+            WHERE (
+                    %(all)s
+                    OR (zone_id = ANY(%(zone_ids)s) AND date = ANY(%(dates)s::date[]))
+                )
+                AND id NOT IN (SELECT id FROM refreshed)
+            """,
+            params,
+        )
+        self.invalidate_cache()
+
+    @api.model
+    def _cron_refresh_workload(self):
+        self._refresh_workload()
@@ -0,0 +1,33 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+from odoo import api, models
+
+# sale line fields the shipping cost of the workload is computed from
+LINE_WORKLOAD_FIELDS = {"is_delivery", "price_unit"}
+
+
+class SaleOrderLine(models.Model):
+    _inherit = "sale.order.line"
+
+    def _get_workload_pickings(self):
+        """ Pickings whose shipping cost comes from the delivery lines """
+        return self.filtered("is_delivery").mapped("order_id.picking_ids")
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        lines = super().create(vals_list)
+        lines._get_workload_pickings()._refresh_delivery_zone_workload()
+        return lines
+
+    def write(self, vals):
+        if not LINE_WORKLOAD_FIELDS.intersection(vals):
+            return super().write(vals)
+        pickings = self._get_workload_pickings()
+        res = super().write(vals)
+        (pickings | self._get_workload_pickings())._refresh_delivery_zone_workload()
+        return res
+
+    def unlink(self):
+        pickings = self._get_workload_pickings()
+        res = super().unlink()
+        pickings._refresh_delivery_zone_workload()
+        return res
@@ -0,0 +1,46 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+from odoo import models
+
+# move fields the workload of their pickings depends on
+MOVE_WORKLOAD_FIELDS = {"date_expected", "product_id", "product_uom", "product_uom_qty"}
+
+
+class StockMove(models.Model):
+    _inherit = "stock.move"
+
+    # the state of the pickings is computed from their moves, so their
+    # workload is refreshed after the moves change of state
+
+    def _action_confirm(self, merge=True, merge_into=False):
+        moves = super()._action_confirm(merge=merge, merge_into=merge_into)
+        moves.mapped("picking_id")._refresh_delivery_zone_workload()
+        return moves
+
+    def _action_assign(self):
+        res = super()._action_assign()
+        self.mapped("picking_id")._refresh_delivery_zone_workload()
+        return res
+
+    def _do_unreserve(self):
+        res = super()._do_unreserve()
+        self.mapped("picking_id")._refresh_delivery_zone_workload()
+        return res
+
+    def _action_cancel(self):
+        res = super()._action_cancel()
+        self.mapped("picking_id")._refresh_delivery_zone_workload()
+        return res
+
+    def _action_done(self, cancel_backorder=False):
+        moves = super()._action_done(cancel_backorder=cancel_backorder)
+        (self | moves).mapped("picking_id")._refresh_delivery_zone_workload()
+        return moves
+
+    def write(self, vals):
+        if not MOVE_WORKLOAD_FIELDS.intersection(vals):
+            return super().write(vals)
+        pickings = self.mapped("picking_id")
+        keys = pickings._get_workload_keys()
+        res = super().write(vals)
+        pickings._refresh_delivery_zone_workload(keys)
+        return res
@@ -0,0 +1,53 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+from odoo import models
+
+# picking fields changing the workload row a picking is counted in
+WORKLOAD_FIELDS = {
+    "partner_id",
+    "delivery_zone_id",
+    "scheduled_date",
+    "carrier_id",
+    "carrier_price",
+    "company_id",
+    "picking_type_id",
+    "sale_id",
+    "state",
+}
+
+
+class StockPicking(models.Model):
+    _inherit = "stock.picking"
+
+    def _get_workload_keys(self):
+        """ Zone ids and days of the workload rows of the pickings """
+        zone_ids, dates = set(), set()
+        for picking in self.filtered(lambda p: p.delivery_zone_id and p.scheduled_date):
+            zone_ids.add(picking.delivery_zone_id.id)
+            dates.add(picking.scheduled_date.date())
+        return zone_ids, dates
+
+    def _refresh_delivery_zone_workload(self, keys=None):
+        """ Refresh the workload rows of the pickings, and of the zones and
+        days in `keys` if given
+        """
+        zone_ids, dates = self._get_workload_keys()
+        if keys:
+            zone_ids |= keys[0]
+            dates |= keys[1]
+        if zone_ids:
+            self.env["delivery.zone.workload"].sudo()._refresh_workload(zone_ids, dates)
+
+    def write(self, vals):
+        if not WORKLOAD_FIELDS.intersection(vals):
+            return super().write(vals)
+        keys = self._get_workload_keys()
+        res = super().write(vals)
+        self._refresh_delivery_zone_workload(keys)
+        return res
+
+    def unlink(self):
+        keys = self._get_workload_keys()
+        res = super().unlink()
+        if keys[0]:
+            self.env["delivery.zone.workload"].sudo()._refresh_workload(*keys)
+        return res
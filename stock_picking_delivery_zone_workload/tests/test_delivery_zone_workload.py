@@ -0,0 +1,106 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+from odoo.tests import SavepointCase
+
+
+class TestDeliveryZoneWorkload(SavepointCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.zone = cls.env["partner.delivery.zone"].create({"name": "Zone"})
+        cls.other_zone = cls.env["partner.delivery.zone"].create({"name": "Other"})
+        cls.partner = cls.env["res.partner"].create(
+            {"name": "Customer", "delivery_zone_id": cls.zone.id}
+        )
+        cls.carrier = cls.env.ref("delivery.free_delivery_carrier")
+        cls.product = cls.env["product.product"].create(
+            {"name": "Test product", "type": "consu", "weight": 2.0}
+        )
+        cls.picking_type = cls.env.ref("stock.picking_type_out")
+        cls.workload = cls.env["delivery.zone.workload"]
+
+    def _create_picking(self):
+        location_dest = self.env.ref("stock.stock_location_customers")
+        return self.env["stock.picking"].create(
+            {
+                "partner_id": self.partner.id,
+                "picking_type_id": self.picking_type.id,
+                "location_id": self.picking_type.default_location_src_id.id,
+                "location_dest_id": location_dest.id,
+                "carrier_id": self.carrier.id,
+                # without sale order, the carrier price is the shipping cost
+                "carrier_price": 5.0,
+                "move_lines": [
+                    (
+                        0,
+                        0,
+                        {
+                            "name": self.product.name,
+                            "product_id": self.product.id,
+                            "product_uom": self.product.uom_id.id,
+                            "product_uom_qty": 3.0,
+                            "location_id": self.picking_type.default_location_src_id.id,
+                            "location_dest_id": location_dest.id,
+                        },
+                    )
+                ],
+            }
+        )
+
+    def _get_rows(self, zone):
+        return self.workload.search([("zone_id", "=", zone.id)])
+
+    def test_workload_refresh(self):
+        pickings = self._create_picking() | self._create_picking()
+        self.assertFalse(self._get_rows(self.zone))
+        pickings.action_confirm()
+        row = self._get_rows(self.zone)
+        self.assertEqual(row.picking_count, 2)
+        self.assertEqual(row.weight, 12.0)
+        self.assertEqual(row.carrier_price, 10.0)
+        self.assertEqual(row.carrier_id, self.carrier)
+        # the day follows the moves
+        pickings[1].move_lines.date_expected = "2030-01-01 10:00:00"
+        self.assertEqual(self._get_rows(self.zone).mapped("picking_count"), [1, 1])
+        pickings[1].move_lines.date_expected = pickings[0].scheduled_date
+        self.assertEqual(self._get_rows(self.zone).picking_count, 2)
+        pickings[0].delivery_zone_id = self.other_zone
+        self.assertEqual(self._get_rows(self.zone).picking_count, 1)
+        self.assertEqual(self._get_rows(self.other_zone).picking_count, 1)
+        pickings.action_cancel()
+        self.assertFalse(self._get_rows(self.zone) | self._get_rows(self.other_zone))
+        self.workload._refresh_workload()
+        self.assertFalse(self._get_rows(self.zone))
+
+    def test_workload_sale_shipping_cost(self):
+        order = self.env["sale.order"].create(
+            {
+                "partner_id": self.partner.id,
+                "order_line": [
+                    (
+                        0,
+                        0,
+                        {
+                            "product_id": self.product.id,
+                            "product_uom_qty": 1.0,
+                            "product_uom": self.product.uom_id.id,
+                            "price_unit": 10.0,
+                        },
+                    )
+                ],
+            }
+        )
+        order.set_delivery_line(self.carrier, 7.0)
+        order.action_confirm()
+        row = self._get_rows(self.zone)
+        self.assertEqual(row.picking_count, 1)
+        self.assertEqual(row.carrier_price, 7.0)
+        order.order_line.filtered("is_delivery").price_unit = 9.0
+        self.assertEqual(row.carrier_price, 9.0)
+
+    def test_workload_refresh_twice(self):
+        self._create_picking().action_confirm()
+        row = self._get_rows(self.zone)
+        self.workload._refresh_workload()
+        self.workload._refresh_workload([self.zone.id], [row.date])
+        self.assertEqual(self._get_rows(self.zone), row)
+        self.assertEqual(row.picking_count, 1)
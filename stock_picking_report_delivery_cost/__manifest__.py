@@ -4,12 +4,13 @@
 {
     "name": "Delivery cost in Picking Reports",
     "summary": "Show delivery cost in delivery slip and picking operations " " reports",
-    "version": "13.0.1.0.0",
+    "version": "13.0.1.1.0",
     "category": "Stock",
     "website": "https://github.com/OCA/delivery-carrier",
     "author": "Tecnativa, Odoo Community Association (OCA)",
     "license": "AGPL-3",
     "installable": True,
     "depends": ["delivery"],
+    "pre_init_hook": "pre_init_hook",
     "data": ["report/report_shipping.xml", "report/report_deliveryslip.xml"],
 }
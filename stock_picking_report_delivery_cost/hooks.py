@@ -0,0 +1,38 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+def fill_carrier_price_for_report(cr):
+    """ Create and fill the stored delivery cost of the pickings, as the
+    computed field does, with one UPDATE instead of a recompute of every
+    picking.
+    """
+    cr.execute(
+        """
+        ALTER TABLE stock_picking
+        ADD COLUMN IF NOT EXISTS carrier_price_for_report NUMERIC
+        """
+    )
+    cr.execute(
+        """
+        UPDATE stock_picking sp
+        SET carrier_price_for_report = COALESCE(
+            delivery.price_unit, sp.carrier_price, 0.0
+        )
+        FROM stock_picking p
+        LEFT JOIN (
+            SELECT order_id, SUM(price_unit) AS price_unit
+            FROM sale_order_line
+            WHERE is_delivery
+            GROUP BY order_id
+        ) delivery ON delivery.order_id = p.sale_id
+        WHERE p.id = sp.id
+        """
+    )
+    _logger.info("Delivery cost set on %s pickings", cr.rowcount)
+
+
+def pre_init_hook(cr):
+    fill_carrier_price_for_report(cr)
@@ -0,0 +1,10 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+from odoo.addons.stock_picking_report_delivery_cost.hooks import (
+    fill_carrier_price_for_report,
+)
+
+
+def migrate(cr, version):
+    # the delivery cost is now stored, fill it before the ORM computes it
+    # for every picking
+    fill_carrier_price_for_report(cr)
@@ -14,11 +14,17 @@ class StockPicking(models.Model):
         related_sudo=True,  # for avoiding access problems
     )
     carrier_price_for_report = fields.Monetary(
-        compute="_compute_carrier_price_for_report",
+        compute="_compute_carrier_price_for_report", store=True,
     )
 
-    @api.depends("sale_id", "carrier_price")
+    @api.depends(
+        "sale_id.order_line.is_delivery",
+        "sale_id.order_line.price_unit",
+        "carrier_price",
+    )
     def _compute_carrier_price_for_report(self):
+        # read the lines of all the orders at once
+        self.mapped("sale_id.order_line").mapped("is_delivery")
         for picking in self:
             so_lines = picking.sale_id.order_line.filtered("is_delivery")
             if so_lines:
@@ -72,3 +72,17 @@ class TestStockPickingReportDeliveryCost(common.SavepointCase):
         move.qty_done = move.product_qty
         picking.action_done()
         self.assertAlmostEqual(picking.carrier_price_for_report, 5)
+
+    def test_carrier_price_for_report_stored(self):
+        self.order.set_delivery_line(self.carrier, 5)
+        self.order.action_confirm()
+        picking = self.order.picking_ids
+        self.assertAlmostEqual(picking.carrier_price_for_report, 5)
+        delivery_line = self.order.order_line.filtered("is_delivery")
+        delivery_line.price_unit = 7
+        self.assertEqual(
+            self.env["stock.picking"].search(
+                [("id", "=", picking.id), ("carrier_price_for_report", "=", 7)]
+            ),
+            picking,
+        )